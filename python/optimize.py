@@ -7,7 +7,8 @@ Optimize weights for WIS (Weighted Independent Set) branching recurrences.
 This script loads a JSON file describing branching situations and rules, then uses
 numerical optimization to find the best non-increasing weight vector that minimizes
 the worst-case root of a recurrence relation across all situations. The optimization
-is performed using scipy.optimize with multiple random restarts for robustness.
+is performed using scipy.optimize with multiple random restarts for robustness, run
+in parallel on a process pool.
 
 Typical usage:
     python optimize.py wis.json [--method Powell] [--restarts 10] [--seed 1234] ...
@@ -18,14 +19,37 @@ The script prints the best solution found, verifies it, and reports any issues.
 import argparse
 import json
 import math
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, cast
+from itertools import repeat
+from typing import Any, TypeVar, cast
 
 import numpy as np
 import numpy.typing as npt
-from scipy.optimize import minimize
+from scipy.optimize import differential_evolution, minimize
 
-from recurrences.solver import PENALTY, find_root
+from recurrences.solver import PENALTY
+
+try:
+    import numba
+
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; fall back to the numpy batched solver.
+    HAVE_NUMBA = False
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def njit(**kwargs: Any) -> Callable[[_F], _F]:
+    """Compile with numba.njit if numba is installed, else return the function as is."""
+    if not HAVE_NUMBA:
+        return lambda fn: fn
+    return cast(Callable[[_F], _F], numba.njit(**kwargs))
+
+
+prange = numba.prange if HAVE_NUMBA else range
 
 FloatArray = npt.NDArray[np.floating]
 
@@ -64,6 +88,36 @@ class SituationRecord:
     rules: list[RuleRecord]
 
 
+@dataclass(frozen=True)
+class RuleBatch:
+    """
+    All rules' branch-delta vectors stacked into one matrix for batched root finding.
+
+    Rules are stored in situation order, so the rules of each situation are
+    contiguous, and the branches of each rule occupy a contiguous block of rows.
+    Every rule has at least one branch.
+
+    Attributes:
+        branch_delta_matrix: Branch-delta vectors of all rules, in float32 when
+            that is lossless (shape: (total_branches, d)).
+        rule_offsets: Rule i owns rows rule_offsets[i]:rule_offsets[i + 1] of
+            branch_delta_matrix (shape: (num_rules + 1,)).
+        nonempty_situations: Whether each situation has at least one rule,
+            derived from situation_offsets (shape: (num_situations,)).
+        situation_starts: Index of the first rule of each non-empty situation,
+            derived from situation_offsets (shape: (num_nonempty_situations,)).
+        situation_offsets: Situation i owns rules
+            situation_offsets[i]:situation_offsets[i + 1]
+            (shape: (num_situations + 1,)).
+    """
+
+    branch_delta_matrix: np.ndarray  # shape: (total_branches, d)
+    rule_offsets: np.ndarray  # shape: (num_rules + 1,)
+    nonempty_situations: np.ndarray  # shape: (num_situations,)
+    situation_starts: np.ndarray  # shape: (num_nonempty_situations,)
+    situation_offsets: np.ndarray  # shape: (num_situations + 1,)
+
+
 def _load_json(path: str) -> Any:
     """
     Load and parse a JSON file from the given path.
@@ -119,6 +173,15 @@ def _build_situations(
     """
     situations: list[SituationRecord] = []
     d = len(feature_keys)
+    # All branch-delta matrices are views into one block, filled row-wise from
+    # plain lists rather than element by element; _pack_rules reuses the block.
+    total_branches = sum(
+        len(rule.get("branchDeltas") or [])
+        for situation in data
+        for rule in situation.get("rules", [])
+    )
+    block = np.empty((total_branches, d), dtype=float)
+    offset = 0
     for situation in data:
         situation_id = int(situation.get("situationId", 0))
         signature = str(situation.get("signature", f"#{situation_id}"))
@@ -128,10 +191,11 @@ def _build_situations(
             branch_deltas = rule.get("branchDeltas", [])
             if not branch_deltas:
                 continue
-            mat = np.zeros((len(branch_deltas), d), dtype=float)
-            for bi, bd in enumerate(branch_deltas):
-                for fi, key in enumerate(feature_keys):
-                    mat[bi, fi] = float(bd.get(key, 0.0))
+            mat = block[offset : offset + len(branch_deltas)]
+            mat[:] = [
+                [bd.get(key, 0.0) for key in feature_keys] for bd in branch_deltas
+            ]
+            offset += len(branch_deltas)
             situation_rules.append(
                 RuleRecord(
                     situation_id=situation_id,
@@ -148,63 +212,823 @@ def _build_situations(
     return situations
 
 
-def eval_poly_and_derivative(
-    x: float, d: list[float] | np.ndarray
-) -> tuple[float, float]:
+def _shared_block(matrices: list[np.ndarray]) -> np.ndarray:
+    """
+    Stack matrices row-wise, reusing their common base array if they tile it.
+
+    _build_situations fills all rules' matrices into one block in rule order, so
+    packing its situations needs no copy.
+
+    Args:
+        matrices: Non-empty list of matrices with the same number of columns.
+
+    Returns:
+        The matrices' rows, in order, as one array.
+    """
+    base = matrices[0].base
+    if isinstance(base, np.ndarray) and base.ndim == 2 and base.flags.c_contiguous:
+        address = base.ctypes.data
+        for mat in matrices:
+            if mat.base is not base or mat.ctypes.data != address:
+                break
+            address += mat.nbytes
+        else:
+            if address == base.ctypes.data + base.nbytes:
+                return base
+    return np.concatenate(matrices)
+
+
+def _pack_rules(situations: list[SituationRecord], d: int) -> RuleBatch:
+    """
+    Pack the branch-delta matrices of all rules into a single RuleBatch.
+
+    Args:
+        situations: List of situations whose rules should be packed.
+        d: Number of features.
+
+    Returns:
+        The packed RuleBatch.
+    """
+    rules = [r for sit in situations for r in sit.rules]
+    matrix = np.empty((0, d), dtype=np.float32)
+    if rules:
+        matrix = _shared_block([r.branch_delta_matrix for r in rules])
+        # Deltas are typically small integers, which float32 stores exactly at half
+        # the footprint; products with the float64 weights stay in float64. Keep
+        # float64 if any delta would be rounded.
+        matrix32 = matrix.astype(np.float32)
+        if np.array_equal(matrix32, matrix):
+            matrix = matrix32
+    offsets = np.zeros(len(rules) + 1, dtype=np.intp)
+    np.cumsum([r.branch_delta_matrix.shape[0] for r in rules], out=offsets[1:])
+    situation_offsets = np.zeros(len(situations) + 1, dtype=np.intp)
+    np.cumsum([len(sit.rules) for sit in situations], out=situation_offsets[1:])
+    nonempty = situation_offsets[1:] > situation_offsets[:-1]
+    return RuleBatch(
+        branch_delta_matrix=matrix,
+        rule_offsets=offsets,
+        nonempty_situations=nonempty,
+        situation_starts=situation_offsets[:-1][nonempty],
+        situation_offsets=situation_offsets,
+    )
+
+
+def _batched_g(
+    r: FloatArray, neg_deltas: FloatArray, owner: np.ndarray, starts: np.ndarray
+) -> FloatArray:
+    """
+    Evaluate g_i(r_i) = sum_j r_i^(-d_ij) - 1 for every rule i.
+
+    log(r_i) is computed once per rule and shared by all of the rule's branches.
+
+    Args:
+        r: Evaluation points, one per rule (shape: (R,)).
+        neg_deltas: Negated exponents -d_ij of all rules, concatenated
+            (shape: (N,)).
+        owner: Rule index of each entry of neg_deltas (shape: (N,)).
+        starts: Index in neg_deltas of each rule's first entry (shape: (R,)).
+
+    Returns:
+        Array of g values (shape: (R,)).
+    """
+    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
+        terms = np.log(r)[owner]
+        terms *= neg_deltas
+        np.exp(terms, out=terms)
+    return cast(FloatArray, np.add.reduceat(terms, starts) - 1.0)
+
+
+def batched_root(
+    deltas: FloatArray,
+    rule_offsets: np.ndarray,
+    *,
+    xtol: float = 2e-12,
+    rtol: float = 4 * np.finfo(float).eps,
+    maxiter: int = 100,
+) -> FloatArray:
+    """
+    Solve sum_j r^(-d_ij) = 1 for r >= 1, for all rules i at once.
+
+    Vectorized counterpart of recurrences.solver.find_root: every rule is bracketed
+    analytically and all brackets are then refined together on numpy arrays with
+    Chandrupatla's method (inverse quadratic interpolation safeguarded by
+    bisection), so one call replaces a separate scalar root solve per rule.
+
+    Args:
+        deltas: Exponents of all rules, concatenated (shape: (N,)).
+        rule_offsets: Rule i owns deltas[rule_offsets[i]:rule_offsets[i + 1]];
+            every rule must own at least one entry (shape: (R + 1,)).
+        xtol: Absolute tolerance on the root.
+        rtol: Relative tolerance on the root.
+        maxiter: Maximum number of iterations.
+
+    Returns:
+        Array of roots (shape: (R,)), with the same special values as find_root:
+        1.0 for single-branch rules and PENALTY for rules without a root >= 1.
+    """
+    m = np.diff(rule_offsets)
+    out = np.ones(m.size, dtype=float)
+    if m.size == 0:
+        return out
+    min_delta = np.minimum.reduceat(deltas, rule_offsets[:-1])
+    out[(m >= 2) & (min_delta <= 0.0)] = PENALTY
+
+    active = (m >= 2) & (min_delta > 0.0)
+    idx = np.flatnonzero(active)
+    if idx.size == 0:
+        return out
+    m_act = m[idx]
+    neg_d_act = -deltas[np.repeat(active, m)]
+    owner = np.repeat(np.arange(idx.size), m_act)
+    starts = np.zeros(idx.size, dtype=np.intp)
+    np.cumsum(m_act[:-1], out=starts[1:])
+
+    # Analytic bracket, as in find_root: sum_j b^(-d_j) <= m * b^(-min_delta) <= 1
+    # for b >= m^(1/min_delta). Computed in log-space to avoid overflow.
+    b_cap = 1e12
+    exponent = np.log(m_act) / min_delta[idx]
+    capped = exponent >= math.log(b_cap / 1.01)
+    b = np.where(
+        capped, b_cap, np.maximum(2.0, np.exp(np.where(capped, 0.0, exponent)) * 1.01)
+    )
+    fb = _batched_g(b, neg_d_act, owner, starts)
+    # Only a capped bracket can fail to contain the root.
+    no_root = capped & ~(fb <= 0.0)
+
+    # Chandrupatla's method: [x1, x2] is the current bracket with x1 the newest
+    # point, x3 the point discarded last, and t the relative position of the next
+    # point within the bracket.
+    x1 = np.ones_like(b)
+    f1 = (m_act - 1).astype(float)  # g(1) = m - 1
+    x2, f2 = b, fb
+    t = np.full_like(b, 0.5)
+    root = np.full_like(b, np.nan)
+    converged = no_root.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(maxiter):
+            xt = x1 + t * (x2 - x1)
+            ft = _batched_g(xt, neg_d_act, owner, starts)
+            same = np.sign(ft) == np.sign(f1)
+            x3 = np.where(same, x1, x2)
+            f3 = np.where(same, f1, f2)
+            x2 = np.where(same, x2, x1)
+            f2 = np.where(same, f2, f1)
+            x1, f1 = xt, ft
+
+            better = np.abs(f1) < np.abs(f2)
+            x_min = np.where(better, x1, x2)
+            tol = xtol + rtol * np.abs(x_min)
+            dx = np.abs(x2 - x1)
+            done = ~converged & ((dx < tol) | (f1 == 0.0))
+            root[done] = x_min[done]
+            converged |= done
+            if converged.all():
+                break
+
+            # Inverse quadratic interpolation where the three points allow it,
+            # bisection elsewhere; keep the next point away from the bracket ends.
+            xi = (x1 - x2) / (x3 - x2)
+            phi = (f1 - f2) / (f3 - f2)
+            alpha = (x3 - x1) / (x2 - x1)
+            use_iqi = (1.0 - np.sqrt(1.0 - xi) < phi) & (phi < np.sqrt(xi))
+            t_iqi = f1 / (f1 - f2) * f3 / (f3 - f2) - alpha * f1 / (f3 - f1) * f2 / (
+                f2 - f3
+            )
+            tl = 0.5 * tol / dx
+            t = np.clip(np.where(use_iqi, t_iqi, 0.5), tl, 1.0 - tl)
+            t[converged] = 0.5
+
+    out[idx] = np.where(no_root | np.isnan(root), PENALTY, root)
+    return out
+
+
+@njit(cache=True)
+def nb_root(d: FloatArray, x0: float) -> float:
+    """
+    Compiled scalar root finder for sum_j r^(-d[j]) = 1 with r >= 1.
+
+    A plain bracketed Newton iteration, not a port of recurrences.solver.find_root:
+    it returns the same special values for empty, single-branch and non-positive
+    inputs, but has none of find_root's closed forms and no bracket expansion.
+    The root is bracketed analytically in [1, b], with b capped at 1e12 (PENALTY
+    if the capped bracket holds no root), and refined by Newton steps, falling
+    back to bisection whenever a step leaves the current bracket. If 100 steps do
+    not converge, the midpoint of the last bracket is returned, not PENALTY.
+
+    Args:
+        d: Exponents (1-D float array).
+        x0: Initial guess; ignored unless it lies strictly inside the bracket.
+
+    Returns:
+        The root, or find_root's special values (1.0, inf, PENALTY).
+    """
+    m = d.size
+    if m == 0:
+        return math.inf
+    if m == 1:
+        return 1.0
+    min_d = d.min()
+    if min_d <= 0.0:
+        return PENALTY
+
+    b_cap = 1e12
+    exponent = math.log(m) / min_d
+    if exponent >= math.log(b_cap / 1.01):
+        b = b_cap
+        lb = math.log(b)
+        s = 0.0
+        for j in range(m):
+            s += math.exp(-d[j] * lb)
+        if s > 1.0:
+            return PENALTY
+    else:
+        b = max(2.0, math.exp(exponent) * 1.01)
+
+    a = 1.0
+    x = x0 if a < x0 < b else a
+    for _ in range(100):
+        lx = math.log(x)
+        s = 0.0
+        w = 0.0
+        for j in range(m):
+            e = math.exp(-d[j] * lx)
+            s += e
+            w += d[j] * e
+        g = s - 1.0
+        if g == 0.0:
+            return x
+        if g > 0.0:
+            a = x
+        else:
+            b = x
+        x_new = x + g * x / w  # Newton step: x - g / g', with g' = -w / x
+        if not a < x_new < b:
+            x_new = 0.5 * (a + b)
+        if abs(x_new - x) <= 2e-12 + 8.881784197001252e-16 * x_new:
+            return x_new
+        x = x_new
+    return 0.5 * (a + b)
+
+
+@njit(cache=True, parallel=True)
+def nb_rule_values(
+    deltas: FloatArray, rule_offsets: np.ndarray, x0s: FloatArray
+) -> FloatArray:
+    """
+    Compiled counterpart of batched_root, warm-started from x0s.
+
+    Args:
+        deltas: Exponents of all rules, concatenated (shape: (N,)).
+        rule_offsets: Rule i owns deltas[rule_offsets[i]:rule_offsets[i + 1]]
+            (shape: (R + 1,)).
+        x0s: Initial guess per rule (shape: (R,)).
+
+    Returns:
+        Array of roots (shape: (R,)).
+    """
+    num_rules = rule_offsets.size - 1
+    out = np.empty(num_rules)
+    for r in prange(num_rules):
+        out[r] = nb_root(deltas[rule_offsets[r] : rule_offsets[r + 1]], x0s[r])
+    return out
+
+
+@njit(cache=True, parallel=True)
+def nb_f_x(
+    x: FloatArray,
+    matrix: np.ndarray,
+    rule_offsets: np.ndarray,
+    situation_offsets: np.ndarray,
+    x0s: FloatArray,
+    start: np.ndarray,
+) -> float:
+    """
+    Compiled counterpart of Objective.f_x for the packed rules of a RuleBatch.
+
+    Computes all branch deltas, then visits the situations beginning with
+    start[0], solving rules warm-started from x0s (which is updated in place).
+    Once a rule's root is at most the running max, its situation cannot raise
+    the max, so the situation's remaining rules are skipped. start[0] is then
+    set to the worst situation, so that the next call starts from a large max
+    and can skip more rules.
+
+    Args:
+        x: Weight vector in [0, 1]^d.
+        matrix: Branch-delta vectors of all rules (shape: (N, d)).
+        rule_offsets: Rule i owns rows rule_offsets[i]:rule_offsets[i + 1] of
+            matrix (shape: (R + 1,)).
+        situation_offsets: Situation i owns rules
+            situation_offsets[i]:situation_offsets[i + 1] (shape: (S + 1,)).
+        x0s: Initial guess per rule (shape: (R,)).
+        start: Index of the situation to visit first (shape: (1,)).
+
+    Returns:
+        Maximum root value across all situations.
+    """
+    num_branches, d = matrix.shape
+    deltas = np.empty(num_branches)
+    for i in prange(num_branches):
+        acc = 0.0
+        for k in range(d):
+            acc += matrix[i, k] * x[k]
+        deltas[i] = acc
+
+    num_situations = situation_offsets.size - 1
+    worst = 1.0
+    worst_idx = start[0]
+    for step in range(num_situations):
+        i = (start[0] + step) % num_situations
+        best = PENALTY
+        for r in range(situation_offsets[i], situation_offsets[i + 1]):
+            root = nb_root(deltas[rule_offsets[r] : rule_offsets[r + 1]], x0s[r])
+            if not math.isfinite(root):
+                root = PENALTY
+            elif root < PENALTY:
+                x0s[r] = root
+            if root < best:
+                best = root
+                if best <= worst:
+                    break
+        if best > worst:
+            worst = best
+            worst_idx = i
+    start[0] = worst_idx
+    return PENALTY if worst >= PENALTY else worst
+
+
+# Up to this many exponents, a plain math loop beats numpy's per-call overhead.
+_SMALL_M = 16
+
+
+def eval_poly_and_derivative(x: float, d: np.ndarray) -> tuple[float, float]:
     """
     Evaluate the function g(x) = sum_j x^(-d[j]) - 1 and its derivative g'(x).
 
-    Uses log/exp for numerical stability: x^(-a) = exp(-a * log(x)).
+    Uses log/exp for numerical stability: x^(-a) = exp(-a * log(x)). The sum is
+    formed with the log-sum-exp trick, s = exp(M) * sum_j exp(t_j - M) with
+    t_j = -d[j] * log(x) and M = max_j t_j, so no exponential can overflow, and
+    g = expm1(log(s)) is obtained without subtracting 1 from s. Short exponent
+    vectors are summed with math.exp in a Python loop, which avoids numpy's
+    allocation and ufunc-dispatch overhead for tiny arrays.
 
     Args:
         x: The value at which to evaluate the function and its derivative.
-        d: Exponents for each term in the sum.
+        d: Exponents for each term in the sum (1-D float array).
 
     Returns:
         Tuple of (g(x), g'(x)).
     """
     if x <= 0:
         return float("inf"), float("inf")
-    d_arr = np.asarray(d, dtype=float)
-    lx = np.log(x)
-    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
-        exp_terms = np.exp(-d_arr * lx)
-        s = float(np.sum(exp_terms))
-        w = float(np.sum(d_arr * exp_terms))
-    g = s - 1.0
-    gp = -w / x
-    if not np.isfinite(g) or not np.isfinite(gp):
+    if d.size == 0:
+        return -1.0, 0.0
+    lx = math.log(x)
+    if d.size <= _SMALL_M:
+        dl = d.tolist()
+        ts = [-a * lx for a in dl]
+        t_max = max(ts)
+        alpha = 0.0
+        beta = 0.0
+        for a, t_j in zip(dl, ts):
+            e = math.exp(t_j - t_max)
+            alpha += e
+            beta += a * e
+        log_s = t_max + math.log(alpha)
+        try:
+            g = math.expm1(log_s)
+            gp = -math.exp(log_s) * (beta / alpha) / x
+        except OverflowError:
+            return float("inf"), float("inf")
+    else:
+        t = -d * lx
+        t_max = float(t.max())
+        shifted = np.exp(t - t_max)
+        alpha = float(shifted.sum())
+        beta = float((d * shifted).sum())
+        log_s = t_max + math.log(alpha)
+        with np.errstate(over="ignore", invalid="ignore"):
+            g = float(np.expm1(log_s))
+            gp = float(-np.exp(log_s) * (beta / alpha) / x)
+    if not math.isfinite(g) or not math.isfinite(gp):
         return float("inf"), float("inf")
     return g, gp
 
 
-num_root_calls = 0
+# We know the optimum has non-increasing weights x[0] >= x[1] >= ... >= x[d-1].
+# Enforce this by optimizing over ratio-parameters p in [0,1]^d and mapping
+# to x via cumulative products:
+#   x[0] = p[0]
+#   x[i] = x[i-1] * p[i]
+# This parameterization represents exactly all non-increasing vectors in [0,1]^d.
+def _params_to_x(p: FloatArray, out: FloatArray | None = None) -> FloatArray:
+    """
+    Convert parameter vector p in [0,1]^d to a non-increasing weight vector x.
+
+    Args:
+        p: Parameter vector.
+        out: Optional buffer of shape (d,) to compute x in, avoiding allocations.
+            The returned array is then `out` itself.
+
+    Returns:
+        Non-increasing weight vector x.
+    """
+    p = np.asarray(p, dtype=float)
+    if out is None:
+        out = np.empty_like(p)
+    np.clip(p, 0.0, 1.0, out=out)
+    return np.cumprod(out, out=out)
+
+
+def _x_to_params(x: FloatArray) -> FloatArray:
+    """
+    Convert a non-increasing weight vector x to parameter vector p in [0,1]^d.
+
+    Args:
+        x: Weight vector.
+
+    Returns:
+        Parameter vector p.
+    """
+    x = np.clip(np.asarray(x, dtype=float), 0.0, 1.0)
+    p = np.zeros_like(x)
+    if x.size == 0:
+        return p
+    p[0] = x[0]
+    # p[i] = x[i] / x[i-1], or 0 where x[i-1] == 0.
+    prev = x[:-1]
+    np.divide(x[1:], prev, out=p[1:], where=prev > 0.0)
+    return cast(FloatArray, np.clip(p, 0.0, 1.0))
+
+
+class Objective:
+    """
+    The minimax objective: the worst situation's best rule root, in parameter space.
+
+    Calling an Objective with a parameter vector p evaluates f_x at the weight
+    vector _params_to_x(p), memoized on p. Each instance owns its packed rules,
+    warm-start state, and cache, so every worker process can hold an independent
+    copy.
+
+    Attributes:
+        situations: The situations being optimized over.
+        batch: The situations' rules packed for batched root finding.
+        num_calls: Number of calls that missed the memo and evaluated f_x, since
+            the last reset; direct calls of f_x or rule_values are not counted.
+        cache: Objective values by parameter vector rounded to 1e-9, so that
+            repeated probes of the same point are not recomputed.
+    """
+
+    # Stop adding entries to the cache beyond this size.
+    MAX_CACHE_SIZE = 100_000
+
+    def __init__(self, situations: list[SituationRecord], dim: int) -> None:
+        self.situations = situations
+        self.batch = _pack_rules(situations, dim)
+        self.num_calls = 0
+        self.cache: dict[bytes, float] = {}
+        # Scratch buffer for the weight vector; f_x does not keep references to it.
+        self._x_buf = np.empty(dim, dtype=float)
+        # Last root per rule, used to warm-start the compiled solver.
+        self._last_roots = np.full(self.batch.rule_offsets.size - 1, np.nan)
+        # Situation that was worst at the last evaluation, visited first.
+        self._worst_situation = np.zeros(1, dtype=np.intp)
+
+    def rule_values(self, x: np.ndarray) -> FloatArray:
+        """
+        Compute the root value of every rule for weight vector x in one batched solve.
+
+        Args:
+            x: Weight vector.
+
+        Returns:
+            Root value per rule, in RuleBatch row order.
+        """
+        batch = self.batch
+        # One matrix-vector product yields the deltas of every branch of every rule.
+        deltas = batch.branch_delta_matrix @ x
+        if HAVE_NUMBA:
+            roots = nb_rule_values(deltas, batch.rule_offsets, self._last_roots)
+            np.copyto(self._last_roots, roots, where=roots < PENALTY)
+        else:
+            roots = batched_root(deltas, batch.rule_offsets)
+        return cast(FloatArray, np.where(np.isfinite(roots), roots, PENALTY))
+
+    def situation_values(self, roots: FloatArray) -> FloatArray:
+        """
+        For every situation, return the minimum root value over all its rules.
+
+        Args:
+            roots: Root value per rule, as returned by rule_values.
+
+        Returns:
+            Minimum root value per situation; PENALTY for situations without rules.
+        """
+        values = np.full(len(self.situations), PENALTY)
+        if roots.size > 0:
+            # The rules of each situation are contiguous, so one reduceat over the
+            # starts of the non-empty situations yields all per-situation minima.
+            values[self.batch.nonempty_situations] = np.minimum.reduceat(
+                roots, self.batch.situation_starts
+            )
+        return values
+
+    def f_x(self, x: np.ndarray) -> float:
+        """
+        Compute the maximum root value over all situations for a given weight vector x.
+
+        Args:
+            x: Weight vector.
+
+        Returns:
+            Maximum root value across all situations.
+        """
+        # Clip into the scratch buffer; from __call__, x already is that buffer.
+        x = np.clip(np.asarray(x, dtype=float), 0.0, 1.0, out=self._x_buf)
+        if HAVE_NUMBA:
+            batch = self.batch
+            return float(
+                nb_f_x(
+                    x,
+                    batch.branch_delta_matrix,
+                    batch.rule_offsets,
+                    batch.situation_offsets,
+                    self._last_roots,
+                    self._worst_situation,
+                )
+            )
+        values = self.situation_values(self.rule_values(x))
+        worst = max(1.0, float(values.max())) if values.size > 0 else 1.0
+        return PENALTY if worst >= PENALTY else worst
+
+    def __call__(self, p: np.ndarray) -> float:
+        """
+        Objective function in parameter space.
+
+        Args:
+            p: Parameter vector.
+
+        Returns:
+            Objective value for the given parameters.
+        """
+        key = np.round(np.asarray(p, dtype=float), 9).tobytes()
+        value = self.cache.get(key)
+        if value is None:
+            self.num_calls += 1
+            value = self.f_x(_params_to_x(p, out=self._x_buf))
+            if len(self.cache) < self.MAX_CACHE_SIZE:
+                self.cache[key] = value
+        return value
+
+
+# The objective of the current process, set up by _init_worker.
+_worker_objective: Objective | None = None
 
 
-def root(deltas: np.ndarray | list[float], *, x0: float | None = None) -> float:
+def _init_worker(
+    situations: list[SituationRecord], dim: int, num_threads: int | None = None
+) -> None:
     """
-    Wrapper around recurrences.solver.find_root that counts calls.
+    Build the objective for the current (worker) process.
 
     Args:
-        deltas: List of delta values for the exponents.
-        x0: Optional initial guess for the root.
+        situations: The situations being optimized over.
+        dim: Number of features.
+        num_threads: If given, the number of threads of numba's parallel kernels.
+            Pool workers pass 1: the pool already occupies every core, and one
+            thread pool per worker would oversubscribe them.
+    """
+    global _worker_objective
+    if HAVE_NUMBA and num_threads is not None:
+        numba.set_num_threads(num_threads)
+    _worker_objective = Objective(situations, dim)
+
+
+def _run_one(job: tuple[FloatArray, str, dict[str, Any]]) -> tuple[Any, int]:
+    """
+    Run a single restart of scipy.optimize.minimize in the current process.
+
+    Args:
+        job: Tuple of (starting parameters p0, minimize method, minimize options).
 
     Returns:
-        The computed root, or a large penalty if no root exists.
+        Tuple of (the OptimizeResult, number of objective evaluations it used).
+    """
+    p0, method, options = job
+    objective = _worker_objective
+    assert objective is not None, "_init_worker must run first"
+    objective.num_calls = 0
+    objective.cache.clear()
+    res = minimize(
+        objective,
+        p0,
+        method=method,
+        bounds=[(0.0, 1.0)] * p0.size,
+        options=options,
+    )
+    return res, objective.num_calls
+
+
+def _eval_worker(p: FloatArray) -> float:
     """
-    global num_root_calls
-    num_root_calls += 1
-    return find_root(deltas, x0=x0)
+    Evaluate the objective built by _init_worker at parameter vector p.
+
+    Args:
+        p: Parameters in [0, 1]^dim.
+
+    Returns:
+        The objective value.
+    """
+    objective = _worker_objective
+    assert objective is not None, "_init_worker must run first"
+    return objective(p)
+
+
+def _eval_counting(
+    func: Callable[[FloatArray], float], p: FloatArray
+) -> tuple[float, int]:
+    """
+    Evaluate func at p and count the memo misses of this process's objective.
+
+    Args:
+        func: Function that evaluates the objective built by _init_worker.
+        p: Parameters in [0, 1]^dim.
+
+    Returns:
+        Tuple of (the value, number of objective evaluations it used).
+    """
+    objective = _worker_objective
+    assert objective is not None, "_init_worker must run first"
+    before = objective.num_calls
+    value = func(p)
+    return value, objective.num_calls - before
+
+
+class _CountingMap:
+    """
+    Map-like callable for differential_evolution's workers that counts evaluations.
+
+    scipy's nfev also counts points answered from a worker's memo; this counts
+    only the memo misses, as _run_one does.
+
+    Attributes:
+        num_calls: Number of objective evaluations made so far.
+    """
+
+    def __init__(self, map_fn: Callable[..., Any]) -> None:
+        self._map_fn = map_fn
+        self.num_calls = 0
+
+    def __call__(
+        self, func: Callable[[FloatArray], float], iterable: Any
+    ) -> list[float]:
+        """
+        Apply func to every parameter vector, like map, and count the evaluations.
+
+        Args:
+            func: Function that evaluates the objective built by _init_worker.
+            iterable: Parameter vectors.
+
+        Returns:
+            The values, in order.
+        """
+        values: list[float] = []
+        for value, num_calls in self._map_fn(_eval_counting, repeat(func), iterable):
+            values.append(value)
+            self.num_calls += num_calls
+        return values
+
+
+def _run_restarts(
+    situations: list[SituationRecord],
+    dim: int,
+    p0s: list[np.ndarray],
+    *,
+    method: str,
+    options: dict[str, Any],
+    workers: int,
+) -> Any:
+    """
+    Run one local minimization per starting point and return the best result.
+
+    Args:
+        situations: The situations being optimized over.
+        dim: Number of features.
+        p0s: Starting points in parameter space.
+        method: scipy.optimize.minimize method.
+        options: scipy.optimize.minimize options.
+        workers: Maximum number of worker processes.
+
+    Returns:
+        The OptimizeResult with the smallest objective value.
+    """
+    jobs = [(p0, method, options) for p0 in p0s]
+
+    # Restarts are independent, so run them on a process pool; each worker builds
+    # its own Objective. With a single worker, run them in this process instead.
+    workers = max(1, min(workers, len(jobs)))
+    executor: ProcessPoolExecutor | None = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(situations, dim, 1),
+        )
+        outcomes = executor.map(_run_one, jobs)
+    else:
+        _init_worker(situations, dim)
+        outcomes = map(_run_one, jobs)
+
+    best_res = None
+    try:
+        for run_idx, (res, num_calls) in enumerate(outcomes):
+            print(f"\nRun {run_idx + 1}/{len(p0s)}: minimizing…", end="")
+            if best_res is None or res.fun < best_res.fun:
+                print(f" found value={res.fun}", end="")
+                best_res = res
+            print(f"  --- {num_calls} objective evaluations")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    assert best_res is not None
+    return best_res
+
+
+def _run_differential_evolution(
+    situations: list[SituationRecord],
+    dim: int,
+    *,
+    method: str,
+    options: dict[str, Any],
+    maxiter: int,
+    tol: float,
+    seed: int,
+    workers: int,
+) -> Any:
+    """
+    Search globally with differential evolution, then polish with a local method.
+
+    The population of each generation is evaluated in parallel on `workers`
+    processes. scipy's built-in polish uses L-BFGS-B, which is ill-suited to a
+    max-over-roots objective, so the DE optimum is polished with `method` instead.
+
+    Args:
+        situations: The situations being optimized over.
+        dim: Number of features.
+        method: scipy.optimize.minimize method used for polishing.
+        options: scipy.optimize.minimize options used for polishing.
+        maxiter: Maximum number of generations.
+        tol: Relative convergence tolerance of the population.
+        seed: Random seed.
+        workers: Number of worker processes.
+
+    Returns:
+        The better of the DE result and the polished result.
+    """
+    # Each worker keeps one Objective (and its warm starts) across generations;
+    # only the trial vectors travel between processes.
+    print("\nDifferential evolution: minimizing…", end="")
+    _init_worker(situations, dim)
+    de_kwargs: dict[str, Any] = {
+        "bounds": [(0.0, 1.0)] * dim,
+        "maxiter": maxiter,
+        "tol": tol,
+        "seed": seed,
+        "init": "sobol",
+        "polish": False,
+        "updating": "deferred",
+    }
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(situations, dim, 1),
+        ) as executor:
+            counting_map = _CountingMap(executor.map)
+            de_res = differential_evolution(
+                _eval_worker, workers=counting_map, **de_kwargs
+            )
+    else:
+        counting_map = _CountingMap(map)
+        de_res = differential_evolution(_eval_worker, workers=counting_map, **de_kwargs)
+    print(f" found value={de_res.fun}", end="")
+
+    res, num_calls = _run_one((de_res.x, method, options))
+    print(f"  --- {counting_map.num_calls + num_calls} objective evaluations")
+    # A bounded local search may end marginally above its starting value.
+    if res.fun < de_res.fun:
+        print(f"Polished with {method}: found value={res.fun}")
+        return res
+    return de_res
 
 
 def main() -> None:
     """
     Main entry point for the optimizer script.
 
-    Loads JSON data, sets up the optimization problem, runs multiple restarts,
-    and prints the best solution found along with verification.
+    Loads JSON data, sets up the optimization problem, runs multiple restarts or
+    differential evolution, and prints the best solution found along with verification.
     """
-    global num_root_calls
     parser = argparse.ArgumentParser(
         description="Optimize weights for WIS branching recurrences"
     )
@@ -246,6 +1070,19 @@ def main() -> None:
         default=1e-6,
         help="Objective tolerance (Powell: ftol)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes evaluating restarts or DE generations",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=["restarts", "de"],
+        default="restarts",
+        help="Global search: local minimizations from multiple starting points, "
+        "or differential evolution polished with --method",
+    )
     args = parser.parse_args()
 
     data = _load_json(args.json_path)
@@ -265,125 +1102,6 @@ def main() -> None:
     for i, k in enumerate(feature_keys):
         print(f"  x[{i}] = {k}")
 
-    # Cache last root per rule to seed the next root solve.
-    root_cache: dict[tuple[int, int], float] = {}
-
-    # We know the optimum has non-increasing weights x[0] >= x[1] >= ... >= x[d-1].
-    # Enforce this by optimizing over ratio-parameters p in [0,1]^d and mapping
-    # to x via cumulative products:
-    #   x[0] = p[0]
-    #   x[i] = x[i-1] * p[i]
-    # This parameterization represents exactly all non-increasing vectors in [0,1]^d.
-    def _params_to_x(p: FloatArray) -> FloatArray:
-        """
-        Convert parameter vector p in [0,1]^d to a non-increasing weight vector x.
-
-        Args:
-            p: Parameter vector.
-
-        Returns:
-            Non-increasing weight vector x.
-        """
-        p = np.clip(np.asarray(p, dtype=float), 0.0, 1.0)
-        return np.cumprod(p)
-
-    def _x_to_params(x: FloatArray) -> FloatArray:
-        """
-        Convert a non-increasing weight vector x to parameter vector p in [0,1]^d.
-
-        Args:
-            x: Weight vector.
-
-        Returns:
-            Parameter vector p.
-        """
-        x = np.clip(np.asarray(x, dtype=float), 0.0, 1.0)
-        p = np.empty_like(x)
-        if x.size == 0:
-            return p
-        p[0] = x[0]
-        prev = x[0]
-        for i in range(1, x.size):
-            cur = x[i]
-            if prev <= 0.0:
-                p[i] = 0.0
-            else:
-                p[i] = cur / prev
-            prev = cur
-        return cast(FloatArray, np.clip(p, 0.0, 1.0))
-
-    def _rule_value(x: np.ndarray, rule: RuleRecord) -> float:
-        """
-        Compute the root value for a given rule and weight vector x, using caching.
-
-        Args:
-            x: Weight vector.
-            rule: Rule to evaluate.
-
-        Returns:
-            Root value for the rule.
-        """
-        deltas = rule.branch_delta_matrix @ x
-        cache_key = (rule.situation_id, rule.rule_id)
-        val = root(deltas, x0=root_cache.get(cache_key))
-        if not np.isfinite(val):
-            return PENALTY
-        val_f = float(val)
-        if val_f < PENALTY:
-            root_cache[cache_key] = val_f
-        return val_f
-
-    def f_i(x: np.ndarray, i: int) -> float:
-        """
-        For the i-th situation, return the minimum root value over all its rules.
-
-        Args:
-            x: Weight vector.
-            i: Situation index.
-
-        Returns:
-            Minimum root value for the situation.
-        """
-        sit = situations[i]
-        if not sit.rules:
-            return PENALTY
-        best = min(_rule_value(x, r) for r in sit.rules)
-        return best
-
-    def f_x(x: np.ndarray) -> float:
-        """
-        Compute the maximum root value over all situations for a given weight vector x.
-
-        Args:
-            x: Weight vector.
-
-        Returns:
-            Maximum root value across all situations.
-        """
-        x = np.clip(np.asarray(x, dtype=float), 0.0, 1.0)
-        worst = 1.0
-        for i in range(len(situations)):
-            v = f_i(x, i)
-            if v > worst:
-                worst = v
-                if worst >= PENALTY:
-                    return PENALTY
-        return worst
-
-    def f(p: np.ndarray) -> float:
-        """
-        Objective function in parameter space.
-
-        Args:
-            p: Parameter vector.
-
-        Returns:
-            Objective value for the given parameters.
-        """
-        return f_x(_params_to_x(p))
-
-    bounds = [(0.0, 1.0)] * dim
-
     rng = np.random.default_rng(args.seed)
 
     # More diverse starting points (in x-space), then convert to parameter space.
@@ -414,43 +1132,43 @@ def main() -> None:
     for _ in range(max(0, args.restarts - len(p0s))):
         p0s.append(rng.random(dim))
 
-    best_res = None
-    for run_idx, p0 in enumerate(p0s):
-        print(f"\nRun {run_idx + 1}/{len(p0s)}: minimizing…", end="")
-        res = minimize(
-            f,
-            p0,
+    options = {
+        "maxiter": args.maxiter,
+        "maxfev": args.maxfev,
+        "xtol": args.xtol,
+        "ftol": args.ftol,
+    }
+    if args.strategy == "de":
+        best_res = _run_differential_evolution(
+            situations,
+            dim,
+            method=args.method,
+            options=options,
+            maxiter=args.maxiter,
+            tol=args.ftol,
+            seed=args.seed,
+            workers=args.workers,
+        )
+    else:
+        best_res = _run_restarts(
+            situations,
+            dim,
+            p0s,
             method=args.method,
-            bounds=bounds,
-            options={
-                "maxiter": args.maxiter,
-                "maxfev": args.maxfev,
-                "xtol": args.xtol,
-                "ftol": args.ftol,
-            },
+            options=options,
+            workers=args.workers,
         )
-        if best_res is None or res.fun < best_res.fun:
-            print(f" found value={res.fun}", end="")
-            best_res = res
-        print(f"  --- {num_root_calls} calls to f(x)")
-        num_root_calls = 0
 
-    assert best_res is not None
     p_best = np.clip(best_res.x, 0.0, 1.0)
     x_best = _params_to_x(p_best)
     val_best = float(best_res.fun)
 
     # Identify the worst (maximizing) situation at the optimum.
-    per_situation = np.array(
-        [f_i(x_best, i) for i in range(len(situations))], dtype=float
-    )
+    objective = Objective(situations, dim)
+    roots_best = objective.rule_values(x_best)
+    per_situation = objective.situation_values(roots_best)
     worst_situation_idx = int(np.nanargmax(per_situation))
     worst_situation = situations[worst_situation_idx]
-    best_rule_val = PENALTY
-    for r in worst_situation.rules:
-        v = _rule_value(x_best, r)
-        if v < best_rule_val:
-            best_rule_val = v
 
     print("\n=== Result ===")
     print(f"Objective f(x) = {val_best}")
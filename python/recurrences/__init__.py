@@ -16,8 +16,9 @@ Example usage:
 
 from recurrences.formatter import format_asymptotics, format_recurrence
 from recurrences.parser import (ParseError, is_valid_identifier,
-                                parse_recurrence)
-from recurrences.solver import PENALTY, find_root, solve_recurrence
+                                parse_recurrence, parse_recurrence_batch)
+from recurrences.solver import (PENALTY, find_root, find_roots_batch, solve,
+                                solve_recurrence, solve_recurrence_batch)
 from recurrences.types import (ConstantTerm, FunctionTerm, Recurrence, Root,
                                Term)
 
@@ -30,11 +31,15 @@ __all__ = [
     "Root",
     # Parser
     "parse_recurrence",
+    "parse_recurrence_batch",
     "is_valid_identifier",
     "ParseError",
     # Solver
+    "solve",
     "solve_recurrence",
+    "solve_recurrence_batch",
     "find_root",
+    "find_roots_batch",
     "PENALTY",
     # Formatter
     "format_recurrence",
@@ -0,0 +1,61 @@
+"""
+Numba-compiled versions of the solver's root kernels.
+
+Importing this module imports numba, which is slow and optional, so the solver
+only imports it for batches, on first use (see solver._jit_solve_rows). Raises
+ImportError if numba is not installed.
+"""
+
+import math
+
+import numba
+import numpy as np
+
+from .solver import PENALTY, _BRACKET_CAP, _initial_bracket, _newton_bisect
+
+newton_bisect = numba.njit(cache=True)(_newton_bisect)
+initial_bracket = numba.njit(cache=True)(_initial_bracket)
+
+
+def _solve_rows(deltas: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Solve each row of a padded delta matrix like find_root does.
+
+    Args:
+        deltas: Deltas of equation i in deltas[i, : lengths[i]].
+        lengths: Number of deltas of each equation.
+
+    Returns:
+        The root of each equation.
+    """
+    out = np.empty(lengths.size)
+    ones = np.ones(deltas.shape[1])
+    for i in numba.prange(lengths.size):
+        m = lengths[i]
+        d = deltas[i, :m]
+        if m == 0:
+            out[i] = math.inf
+            continue
+        if m == 1:
+            out[i] = 1.0
+            continue
+        min_delta = d.min()
+        if min_delta <= 0.0:
+            out[i] = PENALTY
+            continue
+
+        # Expand the bracket if rounding left g(b) > 0, as find_root does
+        b = initial_bracket(m, min_delta)
+        for _ in range(41):
+            if np.sum(np.exp(-d * math.log(b))) <= 1.0:
+                break
+            b = min(b * 2.0, _BRACKET_CAP)
+        else:
+            out[i] = PENALTY
+            continue
+
+        root = newton_bisect(d, ones[:m], math.nan, b)
+        out[i] = PENALTY if math.isnan(root) else root
+    return out
+
+
+solve_rows = numba.njit(cache=True, parallel=True)(_solve_rows)
@@ -7,7 +7,9 @@ import json
 import math
 import subprocess
 import sys
+from pathlib import Path
 
+import pytest
 from solve_recurrence import main
 
 from . import (format_asymptotics, format_recurrence, parse_recurrence,
@@ -135,6 +137,13 @@ class TestUnicodeSupport:
         assert "^α)" in result
 
 
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the CLI's result cache out of the real home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path / "recurrences"
+
+
 class TestCLI:
     """Tests for the command-line interface."""
 
@@ -163,6 +172,121 @@ class TestCLI:
         exit_code = main([""])
         assert exit_code == 1
 
+    def test_cli_file_input(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """CLI reads the recurrence from a file given as argument."""
+        for name in ("input.txt", "a=b.txt"):
+            path = tmp_path / name
+            path.write_text("T(n) = 3*T(n-1)\n")
+            assert main([str(path)]) == 0
+            assert capsys.readouterr().out == "O(3^n)\n"
+
+    def test_cli_cache(
+        self,
+        cache_home: Path,
+        capsys: pytest.CaptureFixture[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """CLI answers repeated input from the cache, unless it is disabled."""
+        assert main(["T(n) = 2*T(n-1)", "--no-cache"]) == 0
+        assert not cache_home.exists()
+        monkeypatch.setenv("RECURRENCES_NO_CACHE", "1")
+        assert main(["T(n) = 2*T(n-1)"]) == 0
+        assert not cache_home.exists()
+        monkeypatch.setenv("RECURRENCES_NO_CACHE", "")
+
+        assert main(["T(n) = 2*T(n-1)"]) == 0
+        (entry,) = (path for path in cache_home.rglob("*") if path.is_file())
+        assert capsys.readouterr().out == "O(2^n)\nO(2^n)\nO(2^n)\n"
+
+        # A hit ignores whitespace and is output as stored
+        data = json.loads(entry.read_text())
+        data["asymptotics"] = "O(cached)"
+        entry.write_text(json.dumps(data))
+        assert main(["T(n)=2*T(n - 1)"]) == 0
+        assert capsys.readouterr().out == "O(cached)\n"
+        assert main(["T(n) = 2*T(n-1)", "--no-cache"]) == 0
+        assert capsys.readouterr().out == "O(2^n)\n"
+
+        # Unreadable or malformed entries are recomputed
+        data["asymptotics"] = 3
+        for bad in ("{", json.dumps(data), "[]"):
+            entry.write_text(bad)
+            assert main(["T(n) = 2*T(n-1)"]) == 0
+            assert capsys.readouterr().out == "O(2^n)\n"
+
+    def test_cli_cache_is_bounded(
+        self, cache_home: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """CLI drops other versions' caches and prunes a full cache."""
+        stale = cache_home / "0123456789abcdef"
+        stale.mkdir(parents=True)
+        (stale / "entry").write_text("{}")
+        # Directories the CLI does not name are not its to remove
+        foreign = [cache_home / "shared", cache_home / "0123456789ABCDEF"]
+        for path in foreign:
+            path.mkdir()
+            (path / "entry").write_text("{}")
+
+        monkeypatch.setattr("solve_recurrence._CACHE_MAX_ENTRIES", 4)
+        for k in range(2, 12):
+            assert main([f"T(n) = {k}*T(n-1)"]) == 0
+        assert not stale.exists()
+        assert all((path / "entry").exists() for path in foreign)
+        (cache_dir,) = set(cache_home.iterdir()) - set(foreign)
+        assert 2 <= len(list(cache_dir.iterdir())) <= 4
+
+    def test_cli_batch(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """CLI batch mode prints one result per non-blank input line."""
+        text = "T(n) = 2*T(n-1)\n\ninvalid\nT(n) = T(n-1) + T(n-2)\n"
+        assert main(["--batch", text]) == 1
+        assert capsys.readouterr().out.splitlines() == [
+            "O(2^n)",
+            "Error: Parse error: Expected exactly one '=': invalid",
+            "O(1.61804^n)",
+        ]
+
+    def test_cli_batch_json(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """CLI batch mode with --json prints one JSON object per line."""
+        assert main(["--batch", "--json", "T(n) = 2*T(n-1)\nT(n) = 2*T(n-1)"]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2
+        for line in lines:
+            data = json.loads(line)
+            assert data["ok"] is True
+            assert data["root"]["n"] == 2.0
+
+    def test_cli_help(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """CLI prints usage and exits 0 for --help."""
+        with pytest.raises(SystemExit) as exc:
+            main(["--help"])
+        assert exc.value.code == 0
+        assert capsys.readouterr().out.startswith("usage: recurrences")
+
+    def test_cli_abbreviated_and_combined_flags(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """CLI accepts long option prefixes and combined short flags."""
+        assert main(["T(n) = 2*T(n-1)", "--js", "--verb"]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["asymptotics"] == "O(2^n)"
+        assert data["function"] == "T"
+
+        assert main(["T(n) = 2*T(n-1)", "-vv"]) == 0
+        assert capsys.readouterr().out.startswith("Recurrence:")
+
+        with pytest.raises(SystemExit) as exc:
+            main(["-vh"])
+        assert exc.value.code == 0
+
+    def test_cli_unrecognized_arguments(self) -> None:
+        """CLI exits 2 for unknown flags and extra positionals."""
+        for argv in (["--bogus"], ["-vq"], ["T(n) = T(n-1)", "extra"]):
+            with pytest.raises(SystemExit) as exc:
+                main(argv)
+            assert exc.value.code == 2
+
 
 class TestCLISubprocess:
     """Tests for CLI via subprocess (true integration tests)."""
@@ -0,0 +1,286 @@
+"""Tests for the packing, batched root finding and objective in optimize.py."""
+
+import math
+from typing import Any
+
+import numpy as np
+import pytest
+from optimize import (
+    Objective,
+    RuleRecord,
+    SituationRecord,
+    _CountingMap,
+    _build_situations,
+    _eval_worker,
+    _init_worker,
+    _pack_rules,
+    _params_to_x,
+    batched_root,
+    nb_root,
+)
+
+from .solver import PENALTY, find_root
+
+
+def _situation(situation_id: int, *rules: list[list[float]]) -> SituationRecord:
+    """Build a situation from the branch-delta rows of each of its rules."""
+    return SituationRecord(
+        situation_id=situation_id,
+        signature=f"#{situation_id}",
+        rules=[
+            RuleRecord(
+                situation_id=situation_id,
+                signature=f"#{situation_id}",
+                rule_id=rule_id,
+                branch_delta_matrix=np.array(rows, dtype=float),
+            )
+            for rule_id, rows in enumerate(rules)
+        ],
+    )
+
+
+SITUATIONS = [
+    _situation(0, [[1, 0], [0, 1]], [[2, 1], [1, 2], [1, 1]]),
+    _situation(1),
+    _situation(2, [[3, 0]]),
+    _situation(3, [[1, 1], [0, 0]], [[1, 0], [2, 0], [3, 0], [4, 0]]),
+]
+
+
+class TestPackRules:
+    """Tests for _pack_rules()."""
+
+    def test_layout(self) -> None:
+        batch = _pack_rules(SITUATIONS, 2)
+        rules = [rule for sit in SITUATIONS for rule in sit.rules]
+        assert batch.branch_delta_matrix.shape == (12, 2)
+        assert batch.rule_offsets.tolist() == [0, 2, 5, 6, 8, 12]
+        for i, rule in enumerate(rules):
+            rows = slice(batch.rule_offsets[i], batch.rule_offsets[i + 1])
+            assert np.array_equal(
+                batch.branch_delta_matrix[rows], rule.branch_delta_matrix
+            )
+        assert batch.situation_offsets.tolist() == [0, 2, 2, 3, 5]
+        for i, sit in enumerate(SITUATIONS):
+            rules_of_sit = rules[
+                batch.situation_offsets[i] : batch.situation_offsets[i + 1]
+            ]
+            assert rules_of_sit == sit.rules
+        assert batch.nonempty_situations.tolist() == [True, False, True, True]
+        assert batch.situation_starts.tolist() == [0, 2, 3]
+
+    def test_float32_only_when_lossless(self) -> None:
+        assert _pack_rules(SITUATIONS, 2).branch_delta_matrix.dtype == np.float32
+        fractional = [*SITUATIONS, _situation(4, [[0.1, 0], [0, 0.1]])]
+        matrix = _pack_rules(fractional, 2).branch_delta_matrix
+        assert matrix.dtype == np.float64
+        assert matrix[-2, 0] == 0.1
+
+    def test_reuses_built_block(self) -> None:
+        # 0.1 is not exact in float32, so the float64 block is kept as is
+        data: list[dict[str, Any]] = [
+            {"rules": [{"branchDeltas": [{"a": 0.1, "b": 1}, {"a": 1, "b": 0}]}]},
+            {"rules": []},
+            {"rules": [{"branchDeltas": [{"a": 2, "b": 0.25}]}]},
+        ]
+        situations = _build_situations(data, ["a", "b"])
+        matrix = _pack_rules(situations, 2).branch_delta_matrix
+        assert matrix.tolist() == [[0.1, 1.0], [1.0, 0.0], [2.0, 0.25]]
+        for sit in situations:
+            for rule in sit.rules:
+                assert np.shares_memory(matrix, rule.branch_delta_matrix)
+
+    def test_skips_rules_without_branches(self) -> None:
+        data: list[dict[str, Any]] = [
+            {
+                "rules": [
+                    {"ruleId": 1, "branchDeltas": None},
+                    {"ruleId": 2, "branchDeltas": [{"a": 1, "b": 2}]},
+                    {"ruleId": 3, "branchDeltas": []},
+                    {"ruleId": 4},
+                ]
+            },
+        ]
+        (situation,) = _build_situations(data, ["a", "b"])
+        assert [rule.rule_id for rule in situation.rules] == [2]
+        assert situation.rules[0].branch_delta_matrix.tolist() == [[1.0, 2.0]]
+
+    def test_no_rules(self) -> None:
+        batch = _pack_rules([_situation(0)], 3)
+        assert batch.branch_delta_matrix.shape == (0, 3)
+        assert batch.rule_offsets.tolist() == [0]
+        assert batch.situation_offsets.tolist() == [0, 0]
+        assert batch.nonempty_situations.tolist() == [False]
+
+
+class TestBatchedRoot:
+    """Tests for batched_root()."""
+
+    def test_matches_find_root_on_packed_rules(self) -> None:
+        batch = _pack_rules(SITUATIONS, 2)
+        rules = [rule for sit in SITUATIONS for rule in sit.rules]
+        for x in ([1.0, 1.0], [0.7, 0.3], [1.0, 0.0], [0.05, 0.01]):
+            weights = np.array(x)
+            roots = batched_root(
+                batch.branch_delta_matrix @ weights, batch.rule_offsets
+            )
+            for rule, root in zip(rules, roots):
+                expected = find_root(rule.branch_delta_matrix @ weights)
+                assert root == pytest.approx(expected, rel=1e-10)
+
+    def test_special_values(self) -> None:
+        rows: list[list[float]] = [
+            [5.0],  # single branch
+            [1.0, 0.0, 2.0],  # non-positive delta
+            [1e-3, 2e-3, 1e-3],  # capped bracket without a root
+            [1.0, 2.0],
+        ]
+        deltas = np.concatenate([np.array(row) for row in rows])
+        offsets = np.cumsum([0] + [len(row) for row in rows])
+        roots = batched_root(deltas, offsets)
+        assert roots.tolist()[:3] == [1.0, PENALTY, PENALTY]
+        assert [find_root(row) for row in rows[:3]] == [1.0, PENALTY, PENALTY]
+        assert roots[3] == pytest.approx(find_root(rows[3]), rel=1e-10)
+
+    def test_no_rules(self) -> None:
+        assert batched_root(np.empty(0), np.zeros(1, dtype=np.intp)).size == 0
+
+
+class TestNbRoot:
+    """Tests for nb_root()."""
+
+    @pytest.mark.parametrize(
+        "deltas",
+        [
+            [1.0, 2.0],  # closed form in find_root
+            [1.5, 1.5, 1.5],  # closed form in find_root
+            [1.0, 3.0],
+            [0.25, 1.0, 4.0],
+            [2.0, 3.0, 3.0, 5.0, 8.0],
+            [1e-3, 1.0],
+        ],
+    )
+    def test_matches_find_root(self, deltas: list[float]) -> None:
+        d = np.array(deltas)
+        expected = find_root(deltas)
+        assert nb_root(d, np.nan) == pytest.approx(expected, rel=1e-10)
+        # A guess inside the bracket only changes the starting point
+        assert nb_root(d, expected * 1.1) == pytest.approx(expected, rel=1e-10)
+
+    @pytest.mark.parametrize(
+        ("deltas", "expected"),
+        [
+            ([], math.inf),
+            ([5.0], 1.0),
+            ([1.0, 0.0, 2.0], PENALTY),
+            ([1.0, -1.0], PENALTY),
+            ([1e-3, 2e-3, 1e-3], PENALTY),  # capped bracket without a root
+        ],
+    )
+    def test_special_values(self, deltas: list[float], expected: float) -> None:
+        assert nb_root(np.array(deltas, dtype=float), np.nan) == expected
+        assert find_root(deltas) == expected
+
+
+def _random_situations(seed: int, dim: int) -> list[SituationRecord]:
+    """Build situations with random small integer branch deltas."""
+    rng = np.random.default_rng(seed)
+    return [
+        _situation(
+            i,
+            *(
+                rng.integers(0, 4, size=(rng.integers(2, 5), dim)).tolist()
+                for _ in range(rng.integers(1, 5))
+            ),
+        )
+        for i in range(8)
+    ]
+
+
+def _reference_objective(situations: list[SituationRecord], p: np.ndarray) -> float:
+    """The objective computed directly with find_root, rule by rule."""
+    x = _params_to_x(p)
+    worst = 1.0
+    for sit in situations:
+        roots = [find_root(rule.branch_delta_matrix @ x) for rule in sit.rules]
+        worst = max(worst, min(roots, default=PENALTY))
+    return PENALTY if worst >= PENALTY else worst
+
+
+class TestObjective:
+    """Tests for Objective."""
+
+    @pytest.mark.parametrize("use_numba", [False, True])
+    def test_matches_reference(
+        self, use_numba: bool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Objective matches find_root over many consecutive evaluations.
+
+        The compiled objective keeps warm starts and the situation to visit
+        first from one call to the next, so evaluating a sequence of points on
+        one instance also checks its early exit and rotation.
+        """
+        if use_numba:
+            pytest.importorskip("numba")
+        else:
+            monkeypatch.setattr("optimize.HAVE_NUMBA", False)
+
+        dim = 3
+        situations = _random_situations(0, dim)
+        objective = Objective(situations, dim)
+        rng = np.random.default_rng(1)
+        for p in rng.random((30, dim)):
+            # Nearby points must not share a memo entry
+            for q in (p, p + 1e-7):
+                expected = _reference_objective(situations, q)
+                assert objective(q) == pytest.approx(expected, rel=1e-9)
+
+        # Each distinct point is one evaluation; repeats are answered from the memo
+        num_calls = objective.num_calls
+        assert num_calls == 60
+        assert objective(p) == pytest.approx(_reference_objective(situations, p))
+        assert objective.num_calls == num_calls
+        assert len(objective.cache) == 60
+
+    def test_empty_situation(self) -> None:
+        """A situation without rules makes every point infeasible."""
+        objective = Objective([*SITUATIONS], 2)
+        assert objective(np.array([0.5, 0.5])) == PENALTY
+
+    def test_f_x_clips_without_touching_input(self) -> None:
+        """f_x clips x to [0, 1] in its scratch buffer, not in the caller's array."""
+        dim = 3
+        situations = _random_situations(2, dim)
+        objective = Objective(situations, dim)
+        x = np.array([1.5, 0.4, -0.2])
+        clipped = objective.f_x(np.clip(x, 0.0, 1.0))
+        assert objective.f_x(x) == clipped
+        assert x.tolist() == [1.5, 0.4, -0.2]
+
+
+
+class TestInitWorker:
+    """Tests for _init_worker()."""
+
+    def test_limits_numba_threads(self) -> None:
+        """Pool workers run numba's parallel kernels on a single thread."""
+        numba = pytest.importorskip("numba")
+        before = numba.get_num_threads()
+        try:
+            _init_worker(SITUATIONS, 2, 1)
+            assert numba.get_num_threads() == 1
+        finally:
+            numba.set_num_threads(before)
+
+
+class TestCountingMap:
+    """Tests for _CountingMap."""
+
+    def test_counts_memo_misses(self) -> None:
+        _init_worker(SITUATIONS[2:], 2)
+        counting_map = _CountingMap(map)
+        points = [np.array([0.5, 0.5]), np.array([0.2, 0.9]), np.array([0.5, 0.5])]
+        values = counting_map(_eval_worker, points)
+        assert values == [_eval_worker(p) for p in points]
+        assert values[0] == values[2]
+        assert counting_map.num_calls == 2
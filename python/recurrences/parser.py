@@ -11,12 +11,17 @@ Example:
     'T'
     >>> len(rec.rhs)
     2
+
+parse_recurrence_batch() parses many recurrences into flat NumPy arrays for
+solver.solve_recurrence_batch().
 """
 
 import re
-from typing import Final
-
-import regex
+import sys
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Final
 
 from .types import ConstantTerm, FunctionTerm, Recurrence, Term
 
@@ -30,9 +35,15 @@ class ParseError(Exception):
 # Regex for valid identifiers: Unicode letters followed by letters, digits, _, or {}
 # This matches the TypeScript pattern: /^[\p{L}][\p{L}\p{N}_{}]*$/u
 # We use the 'regex' module instead of 're' because Python's re doesn't support \p{} escapes
-IDENTIFIER_PATTERN: Final[regex.Pattern[str]] = regex.compile(
-    r"^[\p{L}][\p{L}\p{N}_{}]*$", regex.UNICODE
-)
+# Importing 'regex' is slow and only non-ASCII input needs it, so the compiled pattern
+# is built on first use and exposed as IDENTIFIER_PATTERN through __getattr__.
+_IDENTIFIER_REGEX: Final[str] = r"^[\p{L}][\p{L}\p{N}_{}]*$"
+
+if TYPE_CHECKING:
+    import numpy as np
+    import regex
+
+    IDENTIFIER_PATTERN: regex.Pattern[str]
 
 # For use inside larger regex patterns (without anchors)
 _IDENTIFIER_BODY: Final[str] = r"[\p{L}][\p{L}\p{N}_{}]*"
@@ -40,6 +51,38 @@ _IDENTIFIER_BODY: Final[str] = r"[\p{L}][\p{L}\p{N}_{}]*"
 # Pattern for numeric literals (integers or decimals, optionally negative)
 NUMBER_PATTERN: Final[re.Pattern[str]] = re.compile(r"^-?\d+(?:\.\d+)?$")
 
+# Pattern for an RHS function term: optional coefficient, function name,
+# parenthesized args
+_TERM_REGEX: Final[str] = rf"^(?:(-?\d+(?:\.\d+)?)\*?)?({_IDENTIFIER_BODY})\(([^)]*)\)$"
+
+# Equivalent pattern for ASCII-only summands, matched by the faster re module
+_ASCII_TERM_PATTERN: Final[re.Pattern[str]] = re.compile(
+    r"^(?:(-?[0-9]+(?:\.[0-9]+)?)\*?)?([A-Za-z][A-Za-z0-9_{}]*)\(([^)]*)\)$"
+)
+
+
+@lru_cache(maxsize=1)
+def _identifier_pattern() -> "regex.Pattern[str]":
+    """Compile the Unicode identifier pattern, importing 'regex' on first use."""
+    import regex
+
+    return regex.compile(_IDENTIFIER_REGEX, regex.UNICODE)
+
+
+@lru_cache(maxsize=1)
+def _term_pattern() -> "regex.Pattern[str]":
+    """Compile the Unicode function term pattern, importing 'regex' on first use."""
+    import regex
+
+    return regex.compile(_TERM_REGEX, regex.UNICODE)
+
+
+def __getattr__(name: str) -> Any:
+    """Provide the lazily compiled IDENTIFIER_PATTERN as a module attribute."""
+    if name == "IDENTIFIER_PATTERN":
+        return _identifier_pattern()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def is_valid_identifier(name: str) -> bool:
     """Check if a string is a valid identifier (function or variable name).
@@ -54,12 +97,14 @@ def is_valid_identifier(name: str) -> bool:
     Returns:
         True if the string is a valid identifier, False otherwise.
     """
-    return bool(IDENTIFIER_PATTERN.match(name))
-
-
-def _escape_regex(value: str) -> str:
-    """Escape special regex characters in a string."""
-    return re.escape(value)
+    if name.isascii():
+        # On ASCII text isalpha() and isalnum() accept exactly [A-Za-z] and
+        # [A-Za-z0-9], so the string methods match without a regex
+        return name[:1].isalpha() and (
+            name.isalnum()
+            or name.replace("_", "").replace("{", "").replace("}", "").isalnum()
+        )
+    return _identifier_pattern().match(name) is not None
 
 
 def _split_rhs(s: str) -> list[str]:
@@ -74,26 +119,30 @@ def _split_rhs(s: str) -> list[str]:
     Returns:
         List of term strings.
     """
+    # Without parentheses every '+' is at depth 0
+    if "(" not in s and ")" not in s:
+        return [t for t in s.split("+") if t]
+
     out: list[str] = []
     depth = 0
-    buf = ""
+    start = 0
 
-    for ch in s:
+    # Track where the current summand starts and slice it out at each '+' at
+    # depth 0, instead of growing a buffer one character at a time. Unmatched
+    # ')' leave the depth at 0.
+    for pos, ch in enumerate(s):
         if ch == "(":
             depth += 1
-            buf += ch
         elif ch == ")":
-            depth = max(0, depth - 1)
-            buf += ch
+            if depth:
+                depth -= 1
         elif ch == "+" and depth == 0:
-            if buf:
-                out.append(buf)
-            buf = ""
-        else:
-            buf += ch
+            if pos > start:
+                out.append(s[start:pos])
+            start = pos + 1
 
-    if buf:
-        out.append(buf)
+    if start < len(s):
+        out.append(s[start:])
 
     return out
 
@@ -122,31 +171,111 @@ def parse_recurrence(text: str) -> Recurrence:
     Raises:
         ParseError: If the input cannot be parsed.
     """
-    # Remove all whitespace
-    cleaned = re.sub(r"\s+", "", text)
+    return _copy_recurrence(_parse_shared(text))
+
+
+def parse_recurrence_batch(
+    texts: Iterable[str],
+) -> "tuple[np.ndarray, np.ndarray, np.ndarray]":
+    """Parse many recurrence relations into a table of their function terms.
+
+    The terms of all recurrences are stored in structure-of-arrays form, ready
+    for solver.solve_recurrence_batch(). Constant terms are left out, since
+    they do not affect the growth rate.
+
+    Args:
+        texts: The recurrence relations as strings. All of them must have the
+            same number of variables.
+
+    Returns:
+        A tuple (coefs, shifts, term_offsets) where coefs has shape
+        (num_terms,), shifts has shape (num_terms, num_vars), and the terms of
+        the i-th recurrence are rows term_offsets[i] to term_offsets[i + 1].
+
+    Raises:
+        ParseError: If any input cannot be parsed.
+        ValueError: If the recurrences have different numbers of variables.
+    """
+    import numpy as np
+
+    coefs: list[float] = []
+    shifts: list[tuple[float, ...]] = []
+    term_offsets = [0]
+    num_vars: int | None = None
+    for text in texts:
+        rec = _parse_shared(text)
+        if num_vars is None:
+            num_vars = len(rec.lhs.vars)
+        elif len(rec.lhs.vars) != num_vars:
+            raise ValueError(
+                f"Expected {num_vars} variables, got {len(rec.lhs.vars)}: {text}"
+            )
+        for term in rec.rhs:
+            if type(term) is FunctionTerm:
+                coefs.append(term.coef)
+                shifts.append(tuple(term.shifts))
+        term_offsets.append(len(coefs))
+
+    shift_arr = np.array(shifts, dtype=float).reshape(len(shifts), num_vars or 0)
+    return (
+        np.array(coefs, dtype=float),
+        shift_arr,
+        np.array(term_offsets, dtype=np.intp),
+    )
+
+
+def _parse_shared(text: str) -> Recurrence:
+    """Parse text through the cache; the result is shared and must not be modified.
+
+    Raises:
+        ParseError: If the input cannot be parsed.
+    """
+    # Remove all whitespace (str.split() splits on exactly the characters \s matches)
+    cleaned = "".join(text.split())
 
     if not cleaned:
         raise ParseError("Empty input")
 
-    # Split on '='
-    parts = cleaned.split("=")
-    if len(parts) != 2:
+    eq = cleaned.find("=")
+    if eq < 0 or cleaned.find("=", eq + 1) >= 0:
         raise ParseError(f"Expected exactly one '=': {text}")
 
-    lhs_str, rhs_str = parts
+    # Identical inputs are parsed once
+    return _parse_cleaned(cleaned)
+
+
+@lru_cache(maxsize=256)
+def _parse_cleaned(cleaned: str) -> Recurrence:
+    """Parse a whitespace-free recurrence relation containing exactly one '='.
+
+    Args:
+        cleaned: The recurrence relation with all whitespace removed.
+
+    Returns:
+        A Recurrence object representing the parsed relation. It is shared by
+        all callers with the same input and must not be modified.
+
+    Raises:
+        ParseError: If the input cannot be parsed.
+    """
+    # Split on the '=' (partition stops at the first one, and there is only one)
+    lhs_str, _, rhs_str = cleaned.partition("=")
 
     if not lhs_str:
         raise ParseError("Empty left-hand side")
     if not rhs_str:
         raise ParseError("Empty right-hand side")
 
-    # Parse LHS: func(var1, var2, ...)
-    lhs_match = re.match(r"^([^(]+)\(([^)]*)\)$", lhs_str)
-    if not lhs_match:
+    # Parse LHS: func(var1, var2, ...), with a non-empty func before the first
+    # '(' and no ')' inside the argument list
+    paren = lhs_str.find("(")
+    if paren <= 0 or not lhs_str.endswith(")"):
         raise ParseError(f"Invalid left-hand side: {lhs_str}")
 
-    func = lhs_match.group(1)
-    raw_args_str = lhs_match.group(2)
+    func = lhs_str[:paren]
+    raw_args_str = lhs_str[paren + 1 : -1]
+    if ")" in raw_args_str:
+        raise ParseError(f"Invalid left-hand side: {lhs_str}")
 
     # Validate function name
     if not is_valid_identifier(func):
@@ -165,9 +294,14 @@ def parse_recurrence(text: str) -> Recurrence:
             raise ParseError(f"Duplicate variable name: {arg}")
         vars_list.append(arg)
 
+    # The variables never change after parsing, so all terms share one tuple.
+    # Names repeat across parses, so they are interned like identifiers in code.
+    func = sys.intern(func)
+    vars_tuple = tuple(sys.intern(v) for v in vars_list)
+
     # Create LHS FunctionTerm (coef=1, all shifts=0)
     lhs = FunctionTerm(
-        coef=1.0, func=func, vars=vars_list, shifts=[0.0] * len(vars_list)
+        coef=1.0, func=func, vars=vars_tuple, shifts=(0.0,) * len(vars_tuple)
     )
 
     # Parse RHS
@@ -175,30 +309,75 @@ def parse_recurrence(text: str) -> Recurrence:
     if not summands:
         raise ParseError("Empty right-hand side")
 
-    raw_terms: list[Term] = []
-
-    # Check if RHS is a single constant
-    if len(summands) == 1 and NUMBER_PATTERN.match(summands[0]):
-        constant_value = float(summands[0])
-        raw_terms.append(ConstantTerm(coef=constant_value))
-    else:
-        for summand in summands:
-            term = _parse_term(summand, func, vars_list)
-            raw_terms.append(term)
+    # Parse the summands, combining terms with the same shifts as we go
+    constant_sum = 0.0
+    function_map: defaultdict[tuple[float, ...], float] = defaultdict(float)
+    for summand in summands:
+        term = _parse_term(summand, func, vars_tuple)
+        # Terms are constructed by _parse_term, so an exact class check suffices
+        if type(term) is FunctionTerm:
+            # tuple() returns term.shifts itself, which is already a tuple
+            function_map[tuple(term.shifts)] += term.coef  # shifts -> coef
+        else:
+            constant_sum += term.coef
 
-    # Combine terms with same shifts
-    terms = _combine_terms(raw_terms, vars_list, func)
+    terms = _combine_terms(constant_sum, function_map, vars_tuple, func)
 
     return Recurrence(lhs=lhs, rhs=terms)
 
 
-def _parse_term(summand: str, func: str, vars_list: list[str]) -> Term:
+def _copy_recurrence(rec: Recurrence) -> Recurrence:
+    """Return a copy of a Recurrence that shares no mutable state with it.
+
+    The terms are immutable and can be shared, so only the rhs list is copied.
+    """
+    return Recurrence(lhs=rec.lhs, rhs=list(rec.rhs))
+
+
+def _parse_number(summand: str) -> float | None:
+    """Return the value of a numeric literal, or None if summand is not one.
+
+    Function terms always contain '(', which rules them out without running
+    NUMBER_PATTERN. float() alone would also accept forms outside the grammar,
+    such as "inf" or "1e5".
+    """
+    if "(" in summand or not NUMBER_PATTERN.match(summand):
+        return None
+    return float(summand)
+
+
+def _match_term(summand: str) -> tuple[str | None, str, str] | None:
+    """Match a function term, using re for ASCII and regex for other summands.
+
+    Args:
+        summand: The term string to match.
+
+    Returns:
+        The (coefficient, function name, arguments) groups, or None if the
+        summand is not a function term. The coefficient is None if absent.
+    """
+    if summand.isascii():
+        ascii_match = _ASCII_TERM_PATTERN.match(summand)
+        if ascii_match is None:
+            return None
+        return ascii_match.group(1), ascii_match.group(2), ascii_match.group(3)
+    unicode_match = _term_pattern().match(summand)
+    if unicode_match is None:
+        return None
+    return unicode_match.group(1), unicode_match.group(2), unicode_match.group(3)
+
+
+def _parse_term(
+    summand: str,
+    func: str,
+    vars_tuple: tuple[str, ...],
+) -> Term:
     """Parse a single term from the RHS.
 
     Args:
         summand: The term string to parse.
         func: The expected function name.
-        vars_list: The list of variable names from the LHS.
+        vars_tuple: The variable names from the LHS.
 
     Returns:
         A Term (FunctionTerm or ConstantTerm).
@@ -207,24 +386,16 @@ def _parse_term(summand: str, func: str, vars_list: list[str]) -> Term:
         ParseError: If the term cannot be parsed.
     """
     # Check if it's a constant
-    if NUMBER_PATTERN.match(summand):
-        return ConstantTerm(coef=float(summand))
+    value = _parse_number(summand)
+    if value is not None:
+        return ConstantTerm(coef=value)
 
     # Try to parse as function call: [coef*]func(args)
-    # Pattern: optional coefficient, function name, parenthesized args
-    # Use regex module for Unicode property support (\p{L}, \p{N})
-    term_pattern = regex.compile(
-        rf"^(?:(-?\d+(?:\.\d+)?)\*?)?({_IDENTIFIER_BODY})\(([^)]*)\)$",
-        regex.UNICODE,
-    )
-    match = term_pattern.match(summand)
-
-    if not match:
+    groups = _match_term(summand)
+    if groups is None:
         raise ParseError(f"Invalid term: {summand}")
 
-    coef_str = match.group(1)
-    fn_name = match.group(2)
-    args_str = match.group(3)
+    coef_str, fn_name, args_str = groups
 
     coef = float(coef_str) if coef_str else 1.0
 
@@ -239,24 +410,26 @@ def _parse_term(summand: str, func: str, vars_list: list[str]) -> Term:
 
     # Parse arguments
     args_raw = [a.strip() for a in args_str.split(",")]
-    if len(args_raw) != len(vars_list):
+    if len(args_raw) != len(vars_tuple):
         raise ParseError(
-            f"Term '{summand}' has {len(args_raw)} args, expected {len(vars_list)}"
+            f"Term '{summand}' has {len(args_raw)} args, expected {len(vars_tuple)}"
         )
 
     # Parse shifts for each variable
     shifts: list[float] = []
-    for i, arg in enumerate(args_raw):
-        var = vars_list[i]
+    for arg, var in zip(args_raw, vars_tuple):
         shift = _parse_shift(arg, var, summand)
         shifts.append(shift)
 
-    return FunctionTerm(coef=coef, func=func, vars=vars_list.copy(), shifts=shifts)
+    return FunctionTerm(coef=coef, func=func, vars=vars_tuple, shifts=tuple(shifts))
 
 
 def _parse_shift(arg: str, var: str, summand: str) -> float:
     """Parse the shift value from an argument.
 
+    The argument must be var[±number], where number has the syntax
+    digits[.digits]; it is scanned with string methods rather than a regex.
+
     Args:
         arg: The argument string (e.g., "n-1", "n", "n+2").
         var: The expected variable name.
@@ -268,45 +441,47 @@ def _parse_shift(arg: str, var: str, summand: str) -> float:
     Raises:
         ParseError: If the argument format is invalid.
     """
-    # Pattern: var[±number]
-    shift_pattern = re.compile(
-        rf"^{_escape_regex(var)}([+-]\d+(?:\.\d+)?)?$", re.UNICODE
-    )
-    match = shift_pattern.match(arg)
+    if not arg.startswith(var):
+        raise ParseError(f"Invalid argument '{arg}' in term '{summand}'")
 
-    if not match:
+    shift_str = arg[len(var) :]
+    if not shift_str:
+        return 0.0
+
+    # str.isdecimal() accepts exactly the characters \d matches
+    int_part, dot, frac_part = shift_str[1:].partition(".")
+    if (
+        shift_str[0] not in "+-"
+        or not int_part.isdecimal()
+        or (dot and not frac_part.isdecimal())
+    ):
         raise ParseError(f"Invalid argument '{arg}' in term '{summand}'")
 
-    shift_str = match.group(1)
-    return float(shift_str) if shift_str else 0.0
+    return float(shift_str)
 
 
 def _combine_terms(
-    raw_terms: list[Term], vars_list: list[str], func: str
+    constant_sum: float,
+    function_map: dict[tuple[float, ...], float],
+    vars_tuple: tuple[str, ...],
+    func: str,
 ) -> list[Term]:
-    """Combine terms with the same shifts.
+    """Build the combined terms from the summed coefficients.
 
-    This merges terms like T(n-1) + 2*T(n-1) into 3*T(n-1).
+    Terms like T(n-1) + 2*T(n-1) have already been summed into an entry
+    (-1.0,) -> 3.0 of function_map; this turns it into 3*T(n-1). Terms whose
+    coefficients cancel are dropped.
 
     Args:
-        raw_terms: List of parsed terms.
-        vars_list: The list of variable names.
+        constant_sum: Sum of all constant terms.
+        function_map: Summed coefficient per shifts tuple, in order of first
+            appearance.
+        vars_tuple: The variable names.
         func: The function name.
 
     Returns:
         List of combined terms.
     """
-    # Separate constants and function terms
-    constant_sum = 0.0
-    function_map: dict[tuple[float, ...], float] = {}  # shifts -> coef
-
-    for term in raw_terms:
-        if isinstance(term, ConstantTerm):
-            constant_sum += term.coef
-        else:
-            key = tuple(term.shifts)
-            function_map[key] = function_map.get(key, 0.0) + term.coef
-
     # Build combined terms list
     terms: list[Term] = []
 
@@ -319,9 +494,7 @@ def _combine_terms(
         if abs(coef) < 1e-12:
             continue
         terms.append(
-            FunctionTerm(
-                coef=coef, func=func, vars=vars_list.copy(), shifts=list(shifts_tuple)
-            )
+            FunctionTerm(coef=coef, func=func, vars=vars_tuple, shifts=shifts_tuple)
         )
 
     return terms
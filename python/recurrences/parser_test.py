@@ -2,7 +2,12 @@
 
 import pytest
 
-from .parser import ParseError, is_valid_identifier, parse_recurrence
+from .parser import (
+    ParseError,
+    is_valid_identifier,
+    parse_recurrence,
+    parse_recurrence_batch,
+)
 from .types import ConstantTerm, FunctionTerm
 
 
@@ -61,14 +66,14 @@ class TestParseRecurrenceBasic:
         """T(n) = T(n-1)"""
         rec = parse_recurrence("T(n) = T(n-1)")
         assert rec.lhs.func == "T"
-        assert rec.lhs.vars == ["n"]
-        assert rec.lhs.shifts == [0.0]
+        assert rec.lhs.vars == ("n",)
+        assert rec.lhs.shifts == (0.0,)
         assert len(rec.rhs) == 1
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
         assert term.coef == 1.0
         assert term.func == "T"
-        assert term.shifts == [-1.0]
+        assert term.shifts == (-1.0,)
 
     def test_simple_two_terms(self) -> None:
         """T(n) = T(n-1) + T(n-2) (Fibonacci)"""
@@ -90,7 +95,7 @@ class TestParseRecurrenceBasic:
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
         assert term.coef == 2.0
-        assert term.shifts == [-1.0]
+        assert term.shifts == (-1.0,)
 
     def test_with_multiple_coefficients(self) -> None:
         """T(n) = 2*T(n-1) + 3*T(n-2)"""
@@ -124,7 +129,7 @@ class TestParseRecurrenceConstants:
         assert len(constants) == 1
         assert constants[0].coef == 1.0
         assert len(functions) == 1
-        assert functions[0].shifts == [-1.0]
+        assert functions[0].shifts == (-1.0,)
 
     def test_negative_constant(self) -> None:
         """T(n) = T(n-1) + -2"""
@@ -142,28 +147,28 @@ class TestParseRecurrenceShifts:
         rec = parse_recurrence("T(n) = T(n+1)")
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
-        assert term.shifts == [1.0]
+        assert term.shifts == (1.0,)
 
     def test_zero_shift(self) -> None:
         """T(n) = 2*T(n)"""
         rec = parse_recurrence("T(n) = 2*T(n)")
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
-        assert term.shifts == [0.0]
+        assert term.shifts == (0.0,)
 
     def test_decimal_shift(self) -> None:
         """T(n) = T(n-0.5)"""
         rec = parse_recurrence("T(n) = T(n-0.5)")
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
-        assert term.shifts == [-0.5]
+        assert term.shifts == (-0.5,)
 
     def test_large_shift(self) -> None:
         """T(n) = T(n-100)"""
         rec = parse_recurrence("T(n) = T(n-100)")
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
-        assert term.shifts == [-100.0]
+        assert term.shifts == (-100.0,)
 
 
 class TestParseRecurrenceMultiVariable:
@@ -172,8 +177,8 @@ class TestParseRecurrenceMultiVariable:
     def test_two_variables(self) -> None:
         """T(m, n) = T(m-1, n) + T(m, n-1)"""
         rec = parse_recurrence("T(m, n) = T(m-1, n) + T(m, n-1)")
-        assert rec.lhs.vars == ["m", "n"]
-        assert rec.lhs.shifts == [0.0, 0.0]
+        assert rec.lhs.vars == ("m", "n")
+        assert rec.lhs.shifts == (0.0, 0.0)
         assert len(rec.rhs) == 2
 
         shifts = {tuple(t.shifts): t for t in rec.rhs if isinstance(t, FunctionTerm)}
@@ -184,7 +189,7 @@ class TestParseRecurrenceMultiVariable:
         """D(m, n) = D(m-1, n) + D(m, n-1) + D(m-1, n-1)"""
         rec = parse_recurrence("D(m, n) = D(m-1, n) + D(m, n-1) + D(m-1, n-1)")
         assert rec.lhs.func == "D"
-        assert rec.lhs.vars == ["m", "n"]
+        assert rec.lhs.vars == ("m", "n")
         assert len(rec.rhs) == 3
 
         shifts = {tuple(t.shifts): t for t in rec.rhs if isinstance(t, FunctionTerm)}
@@ -197,7 +202,7 @@ class TestParseRecurrenceMultiVariable:
         rec = parse_recurrence(
             "T(a, b, c) = T(a-1, b, c) + T(a, b-1, c) + T(a, b, c-1)"
         )
-        assert rec.lhs.vars == ["a", "b", "c"]
+        assert rec.lhs.vars == ("a", "b", "c")
         assert len(rec.rhs) == 3
 
 
@@ -235,13 +240,13 @@ class TestParseRecurrenceUnicode:
     def test_greek_variable_name(self) -> None:
         """T(α) = T(α-1)"""
         rec = parse_recurrence("T(α) = T(α-1)")
-        assert rec.lhs.vars == ["α"]
+        assert rec.lhs.vars == ("α",)
 
     def test_mixed_unicode(self) -> None:
         """μ(λ) = 2*μ(λ-1)"""
         rec = parse_recurrence("μ(λ) = 2*μ(λ-1)")
         assert rec.lhs.func == "μ"
-        assert rec.lhs.vars == ["λ"]
+        assert rec.lhs.vars == ("λ",)
 
 
 class TestParseRecurrenceTermCombining:
@@ -254,7 +259,7 @@ class TestParseRecurrenceTermCombining:
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
         assert term.coef == 3.0
-        assert term.shifts == [-1.0]
+        assert term.shifts == (-1.0,)
 
     def test_combine_constants(self) -> None:
         """T(n) = T(n-1) + 1 + 2 should combine to T(n-1) + 3"""
@@ -353,3 +358,56 @@ class TestParseRecurrenceDecimalCoefficients:
         term = rec.rhs[0]
         assert isinstance(term, FunctionTerm)
         assert term.coef == -0.5
+
+
+class TestParseRecurrenceCaching:
+    """Tests for repeated parsing of the same input."""
+
+    def test_repeated_parse_is_equal(self) -> None:
+        """Inputs differing only in whitespace give equal results."""
+        assert parse_recurrence("T(n) = T(n-1) + 1") == parse_recurrence(
+            "T(n)=T(n-1)+1"
+        )
+
+    def test_results_are_independent(self) -> None:
+        """Modifying a result does not affect later parses."""
+        rec = parse_recurrence("T(n) = T(n-1)")
+        assert isinstance(rec.rhs, list)
+        rec.rhs.append(ConstantTerm(coef=5.0))
+
+        again = parse_recurrence("T(n) = T(n-1)")
+        assert again.rhs == [
+            FunctionTerm(coef=1.0, func="T", vars=("n",), shifts=(-1.0,))
+        ]
+
+
+class TestParseRecurrenceBatch:
+    """Tests for parse_recurrence_batch()."""
+
+    def test_term_table(self) -> None:
+        """Function terms of all inputs are stored in order; constants are dropped."""
+        coefs, shifts, term_offsets = parse_recurrence_batch(
+            ["T(n) = 2*T(n-1) + T(n-2)", "T(n) = 5", "S(n) = S(n-3) + 1"]
+        )
+        assert coefs.tolist() == [2.0, 1.0, 1.0]
+        assert shifts.tolist() == [[-1.0], [-2.0], [-3.0]]
+        assert term_offsets.tolist() == [0, 2, 2, 3]
+
+    def test_multi_variable(self) -> None:
+        """Shifts have one column per variable."""
+        _, shifts, _ = parse_recurrence_batch(["D(m, n) = D(m-1, n) + D(m, n-1)"])
+        assert shifts.tolist() == [[-1.0, 0.0], [0.0, -1.0]]
+
+    def test_empty_batch(self) -> None:
+        coefs, shifts, term_offsets = parse_recurrence_batch([])
+        assert coefs.size == 0
+        assert shifts.size == 0
+        assert term_offsets.tolist() == [0]
+
+    def test_mixed_variable_counts(self) -> None:
+        with pytest.raises(ValueError, match="Expected 1 variables"):
+            parse_recurrence_batch(["T(n) = T(n-1)", "D(m, n) = D(m-1, n)"])
+
+    def test_parse_error(self) -> None:
+        with pytest.raises(ParseError):
+            parse_recurrence_batch(["T(n) = T(n-1)", "T(n) ="])
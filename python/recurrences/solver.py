@@ -16,50 +16,237 @@ Example:
     >>> root = solve_recurrence(rec)
     >>> root  # Golden ratio ≈ 1.618
     1.618...
+
+    When only the root is needed, solve() parses and solves in one cached call:
+    >>> from recurrences import solve
+    >>> solve("T(n) = T(n-1) + T(n-2)")
+    1.618034
 """
 
 import math
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Sequence
+from functools import lru_cache
 from typing import Final
 
 import numpy as np
-from scipy.optimize import root_scalar
 
+from .parser import parse_recurrence
 from .types import FunctionTerm, Recurrence, Root
-from .utils import snap_int
+from .utils import snap_int, snap_int_array
 
 # Large penalty value returned when no valid root exists
 PENALTY: Final[float] = 1e6
 
+# Convergence tolerances for the root iterations (scipy's brentq defaults)
+_ROOT_XTOL: Final[float] = 2e-12
+_ROOT_RTOL: Final[float] = 4 * np.finfo(float).eps
+
+# Largest upper bracket endpoint that find_root tries before giving up
+_BRACKET_CAP: Final[float] = 1e12
+_LOG_BRACKET_CAP: Final[float] = math.log(_BRACKET_CAP)
+
+_LN2: Final[float] = math.log(2.0)
+
+_GOLDEN_RATIO: Final[float] = (1.0 + math.sqrt(5.0)) / 2.0
+
+
+def _weighted_sum(
+    log_x: float, deltas: Sequence[float], coefs: Sequence[float]
+) -> float:
+    """Return sum_j coef_j * x^(-delta_j) for x >= 1, given log(x).
+
+    The bracket searches step through values of x whose logarithm is cheaper
+    to update than to recompute.
+    """
+    s = 0.0
+    for d, c in zip(deltas, coefs):
+        s += c * math.exp(-d * log_x)
+    return s
+
+
+def _illinois(
+    g: Callable[[float], float],
+    a: float,
+    b: float,
+    fa: float,
+    fb: float,
+    *,
+    maxiter: int = 100,
+) -> float | None:
+    """Find a root of g in the bracket [a, b] with the Illinois method.
+
+    This is regula falsi where an endpoint that is retained twice in a row has
+    its function value halved, which avoids the one-sided stagnation of plain
+    false position.
+
+    Args:
+        g: Continuous function with a sign change on [a, b].
+        a: Left bracket endpoint.
+        b: Right bracket endpoint.
+        fa: g(a).
+        fb: g(b), with fa * fb <= 0.
+        maxiter: Maximum number of iterations.
+
+    Returns:
+        The root, or None if the iteration did not converge.
+    """
+    if fa == 0.0:
+        return a
+    if fb == 0.0:
+        return b
+
+    side = 0
+    for _ in range(maxiter):
+        c = (a * fb - b * fa) / (fb - fa)
+        if not a < c < b:
+            c = 0.5 * (a + b)
+        fc = g(c)
+        if fc == 0.0:
+            return c
+        if (fc > 0.0) == (fb > 0.0):
+            b, fb = c, fc
+            if side == -1:
+                fa *= 0.5
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb *= 0.5
+            side = 1
+        if b - a <= _ROOT_XTOL + _ROOT_RTOL * abs(c):
+            return c
+
+    return None
+
+
+def _find_root_pair(a0: float, a1: float, b: float) -> float:
+    """Solve r^(-a0) + r^(-a1) = 1 on the bracket [1, b].
+
+    Two-branch rules are the most common case, and evaluating g with the math
+    module is much cheaper than with numpy arrays.
+
+    Args:
+        a0: First delta (positive).
+        a1: Second delta (positive).
+        b: Upper bracket endpoint.
+
+    Returns:
+        The root, or PENALTY if it does not lie in [1, b].
+    """
+
+    def g(x: float) -> float:
+        lx = math.log(x)
+        return math.exp(-a0 * lx) + math.exp(-a1 * lx) - 1.0
+
+    fb = g(b)
+    if fb > 0.0:
+        return PENALTY
+
+    # g(1) = 1 for two terms
+    root = _illinois(g, 1.0, b, 1.0, fb)
+    if root is None:
+        return PENALTY
+
+    return root
+
 
-def _eval_poly_and_derivative(x: float, deltas: np.ndarray) -> tuple[float, float]:
-    """Evaluate g(x) = sum_j x^(-delta_j) - 1 and its derivative g'(x).
+def _newton_bisect(
+    deltas: Sequence[float] | np.ndarray,
+    coefs: Sequence[float] | np.ndarray,
+    x0: float,
+    b: float,
+    maxiter: int = 100,
+) -> float:
+    """Solve sum_j coef_j * x^(-delta_j) = 1 on [1, b] with safeguarded Newton.
 
-    Uses log/exp for numerical stability: x^(-a) = exp(-a * log(x)).
+    The bracket [lo, hi] around the root shrinks with every evaluation, and a
+    Newton step that leaves it is replaced by bisection. Only scalar loops and
+    the math module are used, so numba can compile this function unchanged
+    (see _jit_solve_rows).
 
     Args:
-        x: The value at which to evaluate.
-        deltas: Array of delta (shift) values.
+        deltas: The (positive) deltas.
+        coefs: The coefficient of each delta.
+        x0: Initial guess; NaN if none is given. Starting from b is safe for
+            positive coefficients, as g is then convex and decreasing, so
+            Newton steps from there approach the root monotonically.
+        b: Upper bracket endpoint with g(b) <= 0 < g(1).
+        maxiter: Maximum number of iterations.
 
     Returns:
-        Tuple of (g(x), g'(x)).
+        The root, or NaN if the iteration did not converge.
+    """
+    lo = 1.0
+    hi = b
+    x = x0 if lo <= x0 <= hi else hi
+    for _ in range(maxiter):
+        # x ** -d is one libm call where exp(-d * log(x)) is two, and it
+        # avoids the rounding error of the intermediate logarithm
+        s = 0.0
+        w = 0.0
+        for d, c in zip(deltas, coefs):
+            e = c * x**-d
+            s += e
+            w += d * e
+        g = s - 1.0
+        if g == 0.0:
+            return x
+        if g > 0.0:
+            lo = x
+        else:
+            hi = x
+
+        # Newton step x - g/g' with g'(x) = -w/x; bisect if it leaves the
+        # bracket or g' is zero
+        x_new = x + g * x / w if w != 0.0 else lo
+        if not lo < x_new < hi:
+            x_new = 0.5 * (lo + hi)
+        if abs(x_new - x) <= _ROOT_XTOL + _ROOT_RTOL * abs(x_new):
+            return x_new
+        x = x_new
+
+    return math.nan
+
+
+def _initial_bracket(m: int, min_delta: float) -> float:
+    """Return b >= 2 with sum_j b^(-delta_j) <= 1 for m deltas >= min_delta > 0.
+
+    Since sum x^(-d_j) <= m * x^(-min_delta), b = m^(1/min_delta) works; it is
+    computed in log-space to avoid overflow when min_delta is tiny, and capped
+    at _BRACKET_CAP.
     """
-    if x <= 0:
-        return float("inf"), float("inf")
+    exponent = math.log(m) / min_delta
+    if not math.isfinite(exponent) or exponent >= math.log(_BRACKET_CAP / 1.01):
+        return _BRACKET_CAP
+    return max(2.0, math.exp(exponent) * 1.01)  # small slack for FP error
+
 
-    lx = np.log(x)
-    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
-        exp_terms = np.exp(-deltas * lx)
-        s = float(np.sum(exp_terms))
-        w = float(np.sum(deltas * exp_terms))
+@lru_cache(maxsize=1)
+def _jit_solve_rows() -> Callable[[np.ndarray, np.ndarray], np.ndarray] | None:
+    """Return the numba-compiled row solver of find_roots_batch, or None.
 
-    g = s - 1.0
-    gp = -w / x
+    numba is imported on first use rather than with this module. Loading it
+    and the compiled kernels takes about a second, which only pays off for
+    batches: find_root always runs _newton_bisect in Python, as a single solve
+    takes tens of microseconds.
+    """
+    try:
+        from ._jit import solve_rows
+    except ImportError:  # numba is optional; solve the rows in Python
+        return None
+    return solve_rows
 
-    if not np.isfinite(g) or not np.isfinite(gp):
-        return float("inf"), float("inf")
 
-    return g, gp
+def _closed_form_root(base: float, a: float) -> float:
+    """Return base^(1/a), or PENALTY if it exceeds the bracket cap of find_root.
+
+    The iterative path cannot find roots beyond _BRACKET_CAP, so neither does
+    the closed form, which keeps all inputs consistent.
+    """
+    # Compare in log-space first, since base^(1/a) overflows for tiny a
+    if math.log(base) / a > _LOG_BRACKET_CAP:
+        return PENALTY
+    return float(base ** (1.0 / a))
 
 
 def find_root(
@@ -74,7 +261,7 @@ def find_root(
 
     Args:
         deltas: Iterable of delta values (shifts from the recurrence).
-        x0: Optional initial guess for Newton's method (used as fast path).
+        x0: Optional initial guess for Newton's method.
 
     Returns:
         The computed root r >= 1, or special values:
@@ -90,8 +277,23 @@ def find_root(
         >>> find_root([1, 1])  # T(n) = 2*T(n-1) → base 2
         2.0
     """
-    d = np.asarray(list(deltas), dtype=float)
-    m = d.size
+    # The root does not depend on the order of the deltas, and without a guess
+    # it is determined by them alone, so it can be cached
+    d = tuple(sorted(float(delta) for delta in deltas))
+    if x0 is None:
+        return _find_root_cached(d)
+    return _find_root(d, x0)
+
+
+@lru_cache(maxsize=4096)
+def _find_root_cached(d: tuple[float, ...]) -> float:
+    """Cached find_root for sorted deltas without an initial guess."""
+    return _find_root(d, None)
+
+
+def _find_root(d: tuple[float, ...], x0: float | None) -> float:
+    """Implement find_root for a tuple of sorted deltas."""
+    m = len(d)
 
     # Empty case: no terms means divergent
     if m == 0:
@@ -102,64 +304,96 @@ def find_root(
         return 1.0
 
     # For m >= 2: if any delta <= 0, there's no root >= 1
-    min_delta = float(np.min(d))
+    min_delta = min(d)
     if min_delta <= 0.0:
         return PENALTY
 
-    def g(x: float) -> float:
-        return _eval_poly_and_derivative(x, d)[0]
+    # Closed forms: m equal deltas a give m * x^(-a) = 1, so x = m^(1/a); and
+    # deltas (a, 2a) give y + y^2 = 1 for y = x^(-a), so x = phi^(1/a)
+    max_delta = max(d)
+    if min_delta == max_delta:
+        return _closed_form_root(m, min_delta)
+    if m == 2 and max_delta == 2.0 * min_delta:
+        return _closed_form_root(_GOLDEN_RATIO, min_delta)
 
-    # Analytic bracket: choose b so that g(b) <= 0
-    # Since sum x^(-d_j) <= m * x^(-min_delta), we need m * b^(-min_delta) <= 1
-    # => b >= m^(1/min_delta)
-    log_m = math.log(m)
-    b_cap = 1e12
+    ones = (1.0,) * m
 
-    # Compute b in log-space to avoid overflow when min_delta is tiny
-    exponent = log_m / min_delta
-    log_cap = math.log(b_cap / 1.01)
+    # Analytic bracket: choose b so that g(b) <= 0
+    b = _initial_bracket(m, min_delta)
 
-    if not math.isfinite(exponent) or exponent >= log_cap:
-        b = b_cap
-    else:
-        b = max(2.0, math.exp(exponent) * 1.01)  # small slack for FP error
+    if m == 2:
+        return _find_root_pair(d[0], d[1], b)
 
-    fb = g(b)
+    log_b = math.log(b)
+    fb = _weighted_sum(log_b, d, ones) - 1.0
 
-    # Fallback: expand bracket if needed
-    if not (np.isfinite(fb) and fb <= 0.0):
+    # Fallback: expand bracket if needed. Doubling b adds log(2) to log(b), so
+    # the logarithm is updated rather than recomputed.
+    if not (math.isfinite(fb) and fb <= 0.0):
         bb = b
         for _ in range(40):
-            bb = min(bb * 2.0, 1e12)
-            fb = g(bb)
-            if np.isfinite(fb) and fb <= 0.0:
+            bb = min(bb * 2.0, _BRACKET_CAP)
+            log_b = min(log_b + _LN2, _LOG_BRACKET_CAP)
+            fb = _weighted_sum(log_b, d, ones) - 1.0
+            if math.isfinite(fb) and fb <= 0.0:
                 b = bb
                 break
         else:
             return PENALTY
 
-    # Fast path: try Newton from initial guess if provided
-    if x0 is not None and np.isfinite(x0):
-        x0c = float(np.clip(x0, 1.0, b))
-        try:
-            sol_n = root_scalar(
-                lambda x: _eval_poly_and_derivative(x, d)[0],
-                fprime=lambda x: _eval_poly_and_derivative(x, d)[1],
-                method="newton",
-                x0=x0c,
-                maxiter=20,
-            )
-            if sol_n.converged and 1.0 <= sol_n.root <= b * 1.000001:
-                return float(sol_n.root)
-        except Exception:
-            pass
-
-    # Robust path: Brent's method with bracket [1, b]
-    sol = root_scalar(g, bracket=(1.0, b), method="brentq")
-    if not sol.converged:
+    # Newton from x0 (or from b), safeguarded by bisection
+    guess = float(x0) if x0 is not None and math.isfinite(x0) else math.nan
+    root = _newton_bisect(d, ones, guess, b)
+    if math.isnan(root):
         return PENALTY
 
-    return float(sol.root)
+    return root
+
+
+def find_roots_batch(deltas_list: Iterable[Iterable[float]]) -> np.ndarray:
+    """Find the roots of many characteristic equations at once.
+
+    Equivalent to [find_root(deltas) for deltas in deltas_list] (up to the root
+    tolerance), but with numba installed all equations are solved in a single
+    compiled, parallel loop over a padded matrix of deltas.
+
+    Args:
+        deltas_list: One iterable of delta values per equation.
+
+    Returns:
+        Array with the root of each equation, using the special values of
+        find_root.
+    """
+    rows = [[float(delta) for delta in deltas] for deltas in deltas_list]
+    solve_rows = _jit_solve_rows()
+    if solve_rows is None:
+        return np.array([find_root(row) for row in rows], dtype=float)
+
+    lengths = np.array([len(row) for row in rows], dtype=np.intp)
+    padded = np.zeros((len(rows), int(lengths.max()) if rows else 0))
+    for i, row in enumerate(rows):
+        padded[i, : len(row)] = row
+    return solve_rows(padded, lengths)
+
+
+@lru_cache(maxsize=2048)
+def solve(text: str) -> Root:
+    """Parse and solve a recurrence relation given as a string.
+
+    Equivalent to solve_recurrence(parse_recurrence(text)), but results are
+    cached by the input string, so repeated queries return immediately.
+
+    Args:
+        text: The recurrence relation as a string.
+
+    Returns:
+        The growth rate base, as returned by solve_recurrence().
+
+    Raises:
+        ParseError: If the input cannot be parsed.
+        ValueError: If the recurrence does not have exactly one variable.
+    """
+    return solve_recurrence(parse_recurrence(text))
 
 
 def solve_recurrence(rec: Recurrence) -> Root:
@@ -191,63 +425,161 @@ def solve_recurrence(rec: Recurrence) -> Root:
             f"Only single-variable recurrences are supported, got {num_vars} variables"
         )
 
-    # Extract function terms (ignore constants)
-    func_terms = [t for t in rec.rhs if isinstance(t, FunctionTerm)]
+    # Collect (delta, coef) of the function terms (ignore constants), with
+    # delta = -shift, sorted so that equal recurrences share a cache entry
+    pairs = sorted(
+        (-t.shifts[0], t.coef) for t in rec.rhs if isinstance(t, FunctionTerm)
+    )
 
     # No function terms means constant or empty RHS → O(1)
-    if not func_terms:
+    if not pairs:
         return 1.0
 
-    # Build arrays of coefficients and deltas
-    coefs: list[float] = []
-    deltas: list[float] = []
+    deltas, coefs = zip(*pairs)
+    return _solve_cached(coefs, deltas)
+
 
-    for term in func_terms:
-        coefs.append(term.coef)
-        deltas.append(-term.shifts[0])  # delta = -shift
+@lru_cache(maxsize=4096)
+def _solve_cached(coefs: tuple[float, ...], deltas: tuple[float, ...]) -> Root:
+    """Cached _solve_terms; the result is determined by the terms alone."""
+    return _solve_terms(coefs, deltas)
 
-    coef_arr = np.array(coefs, dtype=float)
-    delta_arr = np.array(deltas, dtype=float)
 
+def _solve_terms(coefs: Sequence[float], deltas: Sequence[float]) -> Root:
+    """Solve sum_j coef_j * r^(-delta_j) = 1 for the terms of one recurrence.
+
+    This uses the same evaluation and root kernel as find_root, always run in
+    Python: a single solve is far cheaper than importing numba.
+
+    Args:
+        coefs: Coefficients of the function terms (non-empty).
+        deltas: Deltas (negated shifts) of the function terms.
+
+    Returns:
+        The growth rate base, snapped as in solve_recurrence.
+    """
     # Check for non-positive deltas
-    if np.any(delta_arr <= 0):
+    if min(deltas) <= 0:
         return PENALTY
 
-    def g(x: float) -> float:
-        """Evaluate sum_j coef_j * x^(-delta_j) - 1."""
-        if x <= 0:
-            return float("inf")
-        lx = np.log(x)
-        with np.errstate(over="ignore", under="ignore", invalid="ignore"):
-            terms = coef_arr * np.exp(-delta_arr * lx)
-            return float(np.sum(terms)) - 1.0
-
     # Check value at x=1: g(1) = sum(coefs) - 1
-    g1 = g(1.0)
+    g1 = math.fsum(coefs) - 1.0
     if abs(g1) < 1e-12:
         return 1.0
     if g1 < 0:
         # sum(coefs) < 1: root is less than 1, which we don't handle
         return PENALTY
 
-    # Find upper bracket
+    # Find upper bracket b = 2^k; log(b) = k * log(2) needs no log call
     b = 2.0
-    for _ in range(50):
-        fb = g(b)
-        if np.isfinite(fb) and fb <= 0:
+    for k in range(1, 51):
+        fb = _weighted_sum(k * _LN2, deltas, coefs) - 1.0
+        if math.isfinite(fb) and fb <= 0:
             break
         b *= 2
-        if b > 1e12:
+        if b > _BRACKET_CAP:
             return PENALTY
     else:
         return PENALTY
 
-    # Brent's method
-    try:
-        sol = root_scalar(g, bracket=(1.0, b), method="brentq")
-        if sol.converged:
-            return snap_int(float(sol.root))
-    except Exception:
-        pass
+    root = _newton_bisect(deltas, coefs, math.nan, b)
+    if math.isnan(root):
+        return PENALTY
+
+    return snap_int(root)
+
+
+# Largest integer delta solved through the companion matrix; the matrix has one
+# row and column per unit of delta
+_MAX_COMPANION_DEGREE: Final[int] = 64
+
+
+def _solve_integer_terms(coef_arr: np.ndarray, delta_arr: np.ndarray) -> Root | None:
+    """Solve one recurrence with positive integer deltas and coefficients.
+
+    Multiplying sum_j coef_j * r^(-delta_j) = 1 by r^D, with D = max delta, gives
+    the characteristic polynomial r^D - sum_j coef_j * r^(D - delta_j). Its roots
+    are the eigenvalues of the companion matrix (computed by np.roots), and with
+    positive coefficients exactly one of them is positive.
+
+    Args:
+        coef_arr: Positive coefficients of the function terms.
+        delta_arr: Positive integer deltas of the function terms.
+
+    Returns:
+        The unsnapped growth rate base, or None if the scalar solver should be
+        used instead (no root above 1, or a root beyond its bracket).
+    """
+    if float(np.sum(coef_arr)) <= 1.0 + 1e-12:
+        return None
+
+    degree = int(delta_arr.max())
+    poly = np.zeros(degree + 1)
+    poly[0] = 1.0
+    np.subtract.at(poly, delta_arr.astype(np.intp), coef_arr)
+
+    roots = np.roots(poly)
+    real = roots[np.abs(roots.imag) <= 1e-9 * np.maximum(1.0, np.abs(roots))].real
+    root = float(real.max()) if real.size else 0.0
+    if not 1.0 < root <= 2.0**39:
+        return None
+    return root
+
+
+def solve_recurrence_batch(
+    coefs: np.ndarray, shifts: np.ndarray, term_offsets: np.ndarray
+) -> np.ndarray:
+    """Solve a batch of recurrences given as a term table.
+
+    The arguments are the arrays returned by parse_recurrence_batch. Each result
+    equals solve_recurrence on the corresponding recurrence (up to the last
+    snapped digit). Recurrences with small positive integer deltas and positive
+    coefficients are solved through the eigenvalues of their companion matrix;
+    all others use the scalar solver.
+
+    Args:
+        coefs: Coefficients of all function terms, shape (num_terms,).
+        shifts: Shifts of all function terms, shape (num_terms, 1).
+        term_offsets: Terms of recurrence i are coefs[term_offsets[i] :
+            term_offsets[i + 1]], shape (num_recurrences + 1,).
+
+    Returns:
+        The growth rate base of each recurrence, shape (num_recurrences,).
+
+    Raises:
+        ValueError: If the recurrences do not have exactly one variable.
+    """
+    # An empty batch has no variables to check
+    if len(term_offsets) <= 1:
+        return np.empty(0)
+
+    if shifts.ndim != 2 or shifts.shape[1] != 1:
+        raise ValueError(
+            "Only single-variable recurrences are supported, "
+            f"got shifts of shape {shifts.shape}"
+        )
 
-    return PENALTY
+    delta_all = -shifts[:, 0]
+    roots = np.empty(len(term_offsets) - 1)
+    for i, (start, stop) in enumerate(zip(term_offsets[:-1], term_offsets[1:])):
+        if start == stop:
+            roots[i] = 1.0
+            continue
+
+        coef_arr = coefs[start:stop]
+        delta_arr = delta_all[start:stop]
+        root = None
+        if (
+            np.all(coef_arr > 0)
+            and np.all(delta_arr > 0)
+            and np.all(delta_arr == np.round(delta_arr))
+            and delta_arr.max() <= _MAX_COMPANION_DEGREE
+        ):
+            root = _solve_integer_terms(coef_arr, delta_arr)
+        if root is None:
+            root = _solve_terms(coef_arr.tolist(), delta_arr.tolist())
+        roots[i] = root
+
+    # Snapping is idempotent, so the roots already snapped by _solve_terms are
+    # unaffected
+    return snap_int_array(roots)
@@ -4,8 +4,16 @@ import math
 
 import pytest
 
-from .parser import parse_recurrence
-from .solver import PENALTY, find_root, solve_recurrence
+from .parser import ParseError, parse_recurrence, parse_recurrence_batch
+from .solver import (
+    PENALTY,
+    _newton_bisect,
+    find_root,
+    find_roots_batch,
+    solve,
+    solve_recurrence,
+    solve_recurrence_batch,
+)
 from .types import ConstantTerm, FunctionTerm, Recurrence
 
 
@@ -57,6 +65,12 @@ class TestFindRoot:
         result = find_root([1, 2], x0=1.6)
         assert abs(result - phi) < 1e-9
 
+    def test_with_distant_initial_guess(self) -> None:
+        """A guess far from the root still yields an accurate root."""
+        phi = (1 + math.sqrt(5)) / 2
+        assert abs(find_root([1, 2], x0=100.0) - phi) < 1e-12
+        assert abs(find_root([1, 2, 3], x0=1.0) - 1.8392867552141612) < 1e-12
+
     def test_large_deltas(self) -> None:
         """Large deltas still find roots correctly."""
         # r^(-10) + r^(-20) = 1
@@ -64,12 +78,61 @@ class TestFindRoot:
         # At r ≈ 1.07, we have r^(-10) + r^(-20) ≈ 1
         assert 1.0 < result < 1.1
 
+    def test_two_terms(self) -> None:
+        """Two terms: r^(-a) + r^(-b) = 1."""
+        assert abs(find_root([0.5, 0.5]) - 4.0) < 1e-9
+        assert abs(find_root([2, 2]) - math.sqrt(2)) < 1e-12
+        assert abs(find_root([2, 1]) - (1 + math.sqrt(5)) / 2) < 1e-12
+        # Root 2^1000 lies far beyond the bracket cap
+        assert find_root([1e-3, 1e-3]) == PENALTY
+
     def test_many_terms(self) -> None:
         """Many equal terms: n*r^(-1) = 1 => r = n."""
         # 5 terms with delta=1: 5*r^(-1) = 1 => r = 5
         result = find_root([1, 1, 1, 1, 1])
         assert abs(result - 5.0) < 1e-9
 
+    def test_closed_forms(self) -> None:
+        """Equal deltas and golden-ratio pairs are solved exactly."""
+        phi = (1 + math.sqrt(5)) / 2
+        assert find_root([1, 1, 1]) == 3.0
+        assert find_root([3, 3]) == 2.0 ** (1 / 3)
+        assert find_root([3, 6]) == phi ** (1 / 3)
+        assert find_root([1e-3, 1e-3, 1e-3]) == PENALTY
+
+    def test_python_kernel(self) -> None:
+        """The root kernel matches find_root with and without an initial guess."""
+        for deltas in ([1.0, 2.0, 3.0], [0.5, 1.5, 4.0, 7.0], [1.0] * 8):
+            root = find_root(deltas)
+            ones = [1.0] * len(deltas)
+            assert abs(_newton_bisect(deltas, ones, math.nan, 10.0) - root) < 1e-11
+            assert abs(_newton_bisect(deltas, ones, 1.0, 10.0) - root) < 1e-11
+
+
+class TestFindRootsBatch:
+    """Tests for find_roots_batch()."""
+
+    def test_matches_find_root(self) -> None:
+        """Each root equals find_root on the same deltas, special values included."""
+        deltas_list: list[list[float]] = [
+            [1, 2],
+            [1, 2, 3],
+            [0.5, 1.5, 4.0, 7.0],
+            [1] * 8,
+            [2, 2],
+            [1e-3, 1e-3],
+            [1, -1, 2],
+            [1],
+            [],
+        ]
+        roots = find_roots_batch(deltas_list)
+        for deltas, root in zip(deltas_list, roots):
+            expected = find_root(deltas)
+            assert root == expected or abs(root - expected) < 1e-11 * expected
+
+    def test_empty_batch(self) -> None:
+        assert find_roots_batch([]).size == 0
+
 
 class TestSolveRecurrence:
     """Tests for solve_recurrence() with parsed recurrences."""
@@ -135,6 +198,29 @@ class TestSolveRecurrence:
         assert root == 2.0
         assert isinstance(root, float)
 
+    def test_term_order_does_not_matter(self) -> None:
+        """Reordered terms give the same root, also when solved again."""
+        a = parse_recurrence("T(n) = T(n-1) + 2*T(n-3) + 0.5*T(n-2)")
+        b = parse_recurrence("T(n) = 0.5*T(n-2) + 2*T(n-3) + T(n-1)")
+        assert solve_recurrence(a) == solve_recurrence(b) == solve_recurrence(a)
+        assert find_root([3, 1, 2]) == find_root([1, 2, 3])
+
+
+class TestSolve:
+    """Tests for solve() on strings."""
+
+    def test_matches_solve_recurrence(self) -> None:
+        text = "T(n) = T(n-1) + 2*T(n-3)"
+        assert solve(text) == solve_recurrence(parse_recurrence(text))
+        assert solve(text) == solve(text)
+
+    def test_errors_are_raised_every_time(self) -> None:
+        for _ in range(2):
+            with pytest.raises(ParseError):
+                solve("T(n) =")
+            with pytest.raises(ValueError, match="single-variable"):
+                solve("T(m, n) = T(m-1, n)")
+
 
 class TestSolveRecurrenceEdgeCases:
     """Edge case tests for solve_recurrence()."""
@@ -196,3 +282,32 @@ class TestSolveRecurrenceFromTypes:
         rec = Recurrence(lhs=lhs, rhs=rhs)
         root = solve_recurrence(rec)
         assert root == 1.0
+
+
+class TestSolveRecurrenceBatch:
+    """Tests for solve_recurrence_batch()."""
+
+    def test_matches_solve_recurrence(self) -> None:
+        """Batch results equal solving each recurrence on its own."""
+        texts = [
+            "T(n) = T(n-1) + T(n-2)",
+            "T(n) = 2*T(n-1) + 5",
+            "T(n) = 7",
+            "T(n) = 0.5*T(n-1) + 0.5*T(n-2)",
+            "T(n) = T(n-1) + T(n-3) + T(n-7)",
+            "T(n) = T(n-0.5) + T(n-1.5)",
+            "T(n) = 3*T(n-1) + -1*T(n-2)",
+            "T(n) = 0.3*T(n-1)",
+            "T(n) = T(n+1)",
+        ]
+        roots = solve_recurrence_batch(*parse_recurrence_batch(texts))
+        assert list(roots) == [solve_recurrence(parse_recurrence(t)) for t in texts]
+
+    def test_empty_batch(self) -> None:
+        assert solve_recurrence_batch(*parse_recurrence_batch([])).size == 0
+
+    def test_multi_variable_raises(self) -> None:
+        """Multi-variable recurrences raise ValueError."""
+        batch = parse_recurrence_batch(["T(m, n) = T(m-1, n) + T(m, n-1)"])
+        with pytest.raises(ValueError, match="single-variable"):
+            solve_recurrence_batch(*batch)
@@ -12,23 +12,26 @@ from collections.abc import Sequence
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FunctionTerm:
     """A function call with coefficient: coef * func(vars with shifts).
 
     Example: 2*T(n-1, m) has:
         coef = 2
         func = "T"
-        vars = ["n", "m"]
-        shifts = [-1, 0]
+        vars = ("n", "m")
+        shifts = (-1, 0)
 
-    The shifts list is parallel to vars (same length, same order).
+    The shifts are parallel to vars (same length, same order). The parser stores
+    both as tuples; vars is shared by all terms of a recurrence.
+
+    Terms are immutable, so they can be shared between recurrences.
     """
 
     coef: float
     func: str
-    vars: list[str]
-    shifts: list[float]
+    vars: Sequence[str]
+    shifts: Sequence[float]
 
     def __post_init__(self) -> None:
         if len(self.vars) != len(self.shifts):
@@ -38,7 +41,7 @@ class FunctionTerm:
             )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConstantTerm:
     """A constant value in a recurrence RHS.
 
@@ -52,7 +55,7 @@ class ConstantTerm:
 Term = FunctionTerm | ConstantTerm
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Recurrence:
     """A recurrence relation: lhs = sum(rhs).
 
@@ -1,5 +1,7 @@
 """Tests for type definitions."""
 
+from dataclasses import FrozenInstanceError
+
 import pytest
 
 from recurrences.types import ConstantTerm, FunctionTerm, Recurrence
@@ -28,6 +30,11 @@ class TestFunctionTerm:
         term = FunctionTerm(coef=1, func="T", vars=["n"], shifts=[-0.5])
         assert term.shifts == [-0.5]
 
+    def test_is_immutable(self) -> None:
+        term = FunctionTerm(coef=1.0, func="T", vars=("n",), shifts=(-1.0,))
+        with pytest.raises(FrozenInstanceError):
+            term.coef = 2.0  # type: ignore[misc]
+
 
 class TestConstantTerm:
     """Tests for ConstantTerm."""
@@ -6,6 +6,10 @@ to integers when they're very close.
 """
 
 import math
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def snap_int(val: float, ndigits: int = 6) -> float:
@@ -28,14 +32,42 @@ def snap_int(val: float, ndigits: int = 6) -> float:
         >>> snap_int(2.25)
         2.25
     """
-    if not math.isfinite(val):
-        return val
-    rounded = round(val, ndigits)
-    if rounded == int(rounded):
+    # round() passes inf and nan through, and is_integer() is False for them;
+    # it returns an int for int input, which has no is_integer() before 3.12
+    rounded = float(round(val, ndigits))
+    if rounded.is_integer():
         return float(int(rounded))
     return rounded
 
 
+def snap_int_array(values: "np.ndarray", ndigits: int = 6) -> "np.ndarray":
+    """Apply snap_int to every element of an array.
+
+    Each element goes through Python's round() rather than np.round, which
+    scales by a power of ten and so can round ties at the last digit the other
+    way (e.g. -156334.8597925).
+
+    Args:
+        values: The values to potentially snap.
+        ndigits: Decimal places to consider (default 6, i.e., within 1e-6).
+
+    Returns:
+        A new array with the snapped values.
+
+    Examples:
+        >>> import numpy as np
+        >>> snap_int_array(np.array([1.9999999, 2.25, np.inf]))
+        array([2.  , 2.25,  inf])
+    """
+    import numpy as np
+
+    flat = np.asarray(values, dtype=float).ravel()
+    snapped = np.fromiter(
+        (snap_int(val, ndigits) for val in flat.tolist()), float, flat.size
+    )
+    return snapped.reshape(np.shape(values))
+
+
 def format_number(x: float, digits: int = 5) -> str:
     """Format a number with specified decimal digits, trimming trailing zeros.
 
@@ -2,7 +2,9 @@
 
 import math
 
-from recurrences.utils import format_number, snap_int
+import numpy as np
+
+from recurrences.utils import format_number, snap_int, snap_int_array
 
 
 class TestSnapInt:
@@ -17,6 +19,10 @@ class TestSnapInt:
         assert snap_int(2.5) == 2.5
         assert snap_int(2.001) == 2.001
 
+    def test_int_input(self) -> None:
+        assert snap_int(2) == 2.0
+        assert isinstance(snap_int(2), float)
+
     def test_handles_negative_values(self) -> None:
         assert snap_int(-1.9999999) == -2.0
         assert snap_int(-2.0000001) == -2.0
@@ -43,6 +49,32 @@ class TestSnapInt:
         assert snap_int(2.06, ndigits=1) == 2.1
 
 
+class TestSnapIntArray:
+    """Tests for snap_int_array()."""
+
+    def test_matches_snap_int(self) -> None:
+        values = [1.9999999, 2.0000001, 2.25, 2.001, -1.9999999, -0.0000001, 1e6]
+        values += [1.6180339887, 0.0, math.inf, -math.inf]
+        snapped = snap_int_array(np.array(values))
+        assert snapped.tolist() == [snap_int(v) for v in values]
+        assert math.copysign(1.0, snapped[5]) == 1.0
+
+    def test_ties_round_like_snap_int(self) -> None:
+        """Ties at the last digit follow round(), not np.round."""
+        values = [-156334.8597925, 156334.8597925]
+        assert snap_int_array(np.array(values)).tolist() == [
+            -156334.859793,
+            156334.859793,
+        ]
+
+    def test_handles_nan(self) -> None:
+        assert math.isnan(snap_int_array(np.array([math.nan]))[0])
+
+    def test_custom_ndigits(self) -> None:
+        snapped = snap_int_array(np.array([2.01, 2.06]), ndigits=1)
+        assert snapped.tolist() == [2.0, 2.1]
+
+
 class TestFormatNumber:
     """Tests for format_number()."""
 
@@ -17,18 +17,147 @@ Usage:
 
     # Verbose output
     python solve_recurrence.py "T(n) = T(n-1) + T(n-2)" -v
+
+    # Batch mode: one recurrence per line, one result per line
+    python solve_recurrence.py --batch --json < recurrences.txt
+
+Results are cached in $XDG_CACHE_HOME/recurrences (default ~/.cache), so
+solving the same recurrence again skips parsing and solving; pass --no-cache,
+or set RECURRENCES_NO_CACHE to a non-empty value, to bypass the cache. The
+cache is tied to the package's source and holds at most a thousand entries.
 """
 
-import argparse
+import hashlib
 import json
 import math
+import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, NoReturn
+
+# The recurrences package pulls in numpy, so it is imported only once there is
+# input to work on; --help and input errors return without loading it.
+if TYPE_CHECKING:
+    from recurrences.types import Recurrence
+
+
+_USAGE = "usage: recurrences [-h] [-v] [--json] [--batch] [--no-cache] [input]"
+
+# Argument parsing is done by hand rather than with argparse, which (with the
+# re and gettext imports it brings along) is a sizeable share of startup time.
+# The help text mirrors what argparse printed.
+_HELP = f"""{_USAGE}
+
+Parse and solve recurrence relations to find asymptotic growth rates.
+
+positional arguments:
+  input          Recurrence relation string or path to file containing one. If
+                 omitted, reads from stdin.
+
+options:
+  -h, --help     show this help message and exit
+  -v, --verbose  Show verbose output including parsed recurrence.
+  --json         Output results as JSON.
+  --batch        Solve one recurrence per input line, printing one result
+                 (or JSON object) per line.
+  --no-cache     Do not read or write the result cache (also set by a non-
+                 empty RECURRENCES_NO_CACHE environment variable).
+
+Examples:
+  recurrences "T(n) = T(n-1) + T(n-2)"
+  recurrences input.txt
+  echo "T(n) = 2*T(n-1)" | recurrences"""
+
 
-from recurrences.formatter import format_asymptotics, format_recurrence
-from recurrences.parser import ParseError, parse_recurrence
-from recurrences.solver import PENALTY, solve_recurrence
-from recurrences.types import Recurrence
+_LONG_OPTIONS = ("--help", "--verbose", "--json", "--batch", "--no-cache")
+_SHORT_OPTIONS = {"h": "--help", "v": "--verbose"}
+
+
+class _Args(NamedTuple):
+    """Parsed command-line arguments."""
+
+    input: str | None
+    verbose: bool
+    json: bool
+    batch: bool
+    no_cache: bool
+
+
+def _parse_argv(argv: list[str]) -> _Args:
+    """Parse command-line arguments.
+
+    As with argparse, long options may be abbreviated to any unambiguous
+    prefix, and short options may be combined (e.g. -vh).
+
+    Args:
+        argv: Command-line arguments, without the program name.
+
+    Returns:
+        The parsed arguments.
+
+    Raises:
+        SystemExit: With code 0 after printing help for -h/--help, or with
+            code 2 after printing usage for invalid arguments.
+    """
+    input_arg: str | None = None
+    flags: set[str] = set()
+    extra: list[str] = []
+    options_done = False
+    for token in argv:
+        if options_done or token == "-" or not token.startswith("-"):
+            if input_arg is None:
+                input_arg = token
+            else:
+                extra.append(token)
+            continue
+        if token == "--":
+            options_done = True
+            continue
+
+        if token.startswith("--"):
+            if token in _LONG_OPTIONS:
+                options = [token]
+            else:
+                options = [opt for opt in _LONG_OPTIONS if opt.startswith(token)]
+            if len(options) > 1:
+                _usage_error(
+                    f"ambiguous option: {token} could match {', '.join(options)}"
+                )
+        else:
+            options = [_SHORT_OPTIONS.get(char, "") for char in token[1:]]
+            if "" in options:
+                options = []
+        if not options:
+            extra.append(token)
+            continue
+
+        for option in options:
+            if option == "--help":
+                print(_HELP)
+                raise SystemExit(0)
+            flags.add(option)
+
+    if extra:
+        _usage_error(f"unrecognized arguments: {' '.join(extra)}")
+
+    return _Args(
+        input=input_arg,
+        verbose="--verbose" in flags,
+        json="--json" in flags,
+        batch="--batch" in flags,
+        no_cache="--no-cache" in flags,
+    )
+
+
+def _usage_error(message: str) -> NoReturn:
+    """Print usage and an error message to stderr, and exit with code 2.
+
+    Args:
+        message: The error message.
+    """
+    print(_USAGE, file=sys.stderr)
+    print(f"recurrences: error: {message}", file=sys.stderr)
+    raise SystemExit(2)
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -40,34 +169,7 @@ def main(argv: list[str] | None = None) -> int:
     Returns:
         Exit code (0 for success, 1 for error).
     """
-    parser = argparse.ArgumentParser(
-        prog="recurrences",
-        description="Parse and solve recurrence relations to find asymptotic growth rates.",
-        epilog="Examples:\n"
-        '  %(prog)s "T(n) = T(n-1) + T(n-2)"\n'
-        "  %(prog)s input.txt\n"
-        '  echo "T(n) = 2*T(n-1)" | %(prog)s',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
-    parser.add_argument(
-        "input",
-        nargs="?",
-        help="Recurrence relation string or path to file containing one. "
-        "If omitted, reads from stdin.",
-    )
-    parser.add_argument(
-        "-v",
-        "--verbose",
-        action="store_true",
-        help="Show verbose output including parsed recurrence.",
-    )
-    parser.add_argument(
-        "--json",
-        action="store_true",
-        help="Output results as JSON.",
-    )
-
-    args = parser.parse_args(argv)
+    args = _parse_argv(sys.argv[1:] if argv is None else argv)
 
     # Get input text
     try:
@@ -83,27 +185,316 @@ def main(argv: list[str] | None = None) -> int:
         _error("Empty input", args.json)
         return 1
 
-    # Parse the recurrence
+    if args.batch:
+        return _run_batch(text.splitlines(), args.json, args.verbose)
+
+    # Identical recurrences (up to whitespace) are answered from the cache
+    no_cache = args.no_cache or bool(os.environ.get("RECURRENCES_NO_CACHE"))
+    cache_file = None if no_cache else _cache_file(text)
+    solution = None if cache_file is None else _load_cached(cache_file)
+
+    if solution is None:
+        try:
+            solution = _solve_text(text)
+        except _SolveError as e:
+            _error(str(e), args.json)
+            return 1
+
+        if cache_file is not None:
+            _store_cached(cache_file, solution)
+
+    # Format output
+    if args.json:
+        _output_json(solution, args.verbose)
+    else:
+        _output_text(solution, args.verbose)
+
+    return 0
+
+
+def _run_batch(lines: list[str], as_json: bool, verbose: bool) -> int:
+    """Solve one recurrence per line, printing one result per line.
+
+    Blank lines are skipped. Errors are reported in place of the result, on
+    stdout, so that output lines correspond to input lines. Repeated lines
+    are solved once.
+
+    Args:
+        lines: The input lines.
+        as_json: Whether to output a JSON object per line.
+        verbose: Whether to include the parsed recurrence in each result.
+
+    Returns:
+        Exit code (0 if every line was solved, 1 otherwise).
+    """
+    solved: dict[str, _Solution] = {}
+    exit_code = 0
+    for line in lines:
+        key = "".join(line.split())
+        if not key:
+            continue
+
+        solution = solved.get(key)
+        if solution is None:
+            try:
+                solution = solved[key] = _solve_text(line)
+            except _SolveError as e:
+                exit_code = 1
+                if as_json:
+                    print(json.dumps({"ok": False, "error": str(e)}))
+                else:
+                    print(f"Error: {e}")
+                continue
+
+        if as_json:
+            print(json.dumps(_json_result(solution, verbose)))
+        elif verbose:
+            print(f"{solution.recurrence}: {_result_line(solution)}")
+        else:
+            print(_result_line(solution))
+
+    return exit_code
+
+
+class _SolveError(Exception):
+    """Raised with the message to report when the input cannot be solved."""
+
+
+class _Solution(NamedTuple):
+    """Everything the output functions need about a solved recurrence."""
+
+    root: float
+    divergent: bool
+    invalid: bool
+    asymptotics: str
+    recurrence: str
+    function: str
+    variables: tuple[str, ...]
+
+
+def _solve_text(text: str) -> _Solution:
+    """Parse and solve a recurrence.
+
+    Args:
+        text: The recurrence relation as a string.
+
+    Returns:
+        The solution.
+
+    Raises:
+        _SolveError: If the input cannot be parsed or solved.
+    """
+    from recurrences.parser import ParseError, parse_recurrence
+    from recurrences.solver import solve_recurrence
+
     try:
         rec = parse_recurrence(text)
     except ParseError as e:
-        _error(f"Parse error: {e}", args.json)
-        return 1
+        raise _SolveError(f"Parse error: {e}") from e
 
-    # Solve the recurrence
     try:
         root = solve_recurrence(rec)
     except ValueError as e:
-        _error(f"Solver error: {e}", args.json)
-        return 1
+        raise _SolveError(f"Solver error: {e}") from e
 
-    # Format output
-    if args.json:
-        _output_json(rec, root, args.verbose)
-    else:
-        _output_text(rec, root, args.verbose)
+    return _summarize(rec, root)
 
-    return 0
+
+def _summarize(rec: "Recurrence", root: float) -> _Solution:
+    """Format a solved recurrence for output.
+
+    Args:
+        rec: The parsed recurrence.
+        root: The solved root.
+
+    Returns:
+        The solution, with asymptotics left empty if there is no valid root.
+    """
+    from recurrences.formatter import format_asymptotics, format_recurrence
+    from recurrences.solver import PENALTY
+
+    # Check for special cases
+    divergent = math.isinf(root)
+    invalid = not divergent and root >= PENALTY
+    asymptotics = "" if divergent or invalid else format_asymptotics(rec, root)
+    return _Solution(
+        root=root,
+        divergent=divergent,
+        invalid=invalid,
+        asymptotics=asymptotics,
+        recurrence=format_recurrence(rec),
+        function=rec.lhs.func,
+        variables=tuple(rec.lhs.vars),
+    )
+
+
+# Once a cache directory holds this many entries, the older half is removed
+_CACHE_MAX_ENTRIES = 1000
+
+# Cache directories are named after a source digest of this many bytes, in hex
+_CACHE_DIGEST_SIZE = 8
+
+
+def _cache_dir() -> Path | None:
+    """Return the cache directory for the installed version of the package.
+
+    The cache lives in $XDG_CACHE_HOME/recurrences (default ~/.cache), in a
+    subdirectory named after a hash of the package's and this module's source.
+    Any change to the code that computes the results thus starts a fresh cache,
+    and the package is not imported to find out.
+
+    Returns:
+        The directory, or None if it cannot be determined.
+    """
+    import importlib.util
+
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    try:
+        root_dir = Path(cache_home) if cache_home else Path.home() / ".cache"
+        spec = importlib.util.find_spec("recurrences")
+        if spec is None or not spec.submodule_search_locations:
+            return None
+        package = Path(spec.submodule_search_locations[0])
+        digest = hashlib.blake2b(
+            Path(__file__).read_bytes(), digest_size=_CACHE_DIGEST_SIZE
+        )
+        for source in sorted(package.glob("*.py")):
+            if not source.name.endswith("_test.py"):
+                digest.update(source.read_bytes())
+    except (OSError, RuntimeError):
+        return None
+    return root_dir / "recurrences" / digest.hexdigest()
+
+
+def _cache_file(text: str) -> Path | None:
+    """Return the cache file for a recurrence.
+
+    Entries are keyed by a hash of the input with all whitespace removed,
+    since the parser ignores whitespace.
+
+    Args:
+        text: The recurrence relation as given.
+
+    Returns:
+        The path of the cache file, or None if there is no cache directory.
+    """
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    key = hashlib.blake2b("".join(text.split()).encode(), digest_size=16)
+    return cache_dir / key.hexdigest()
+
+
+def _load_cached(path: Path) -> _Solution | None:
+    """Read a cached solution.
+
+    Args:
+        path: The cache file.
+
+    Returns:
+        The solution, or None if it is not cached (or the entry is unreadable
+        or malformed).
+    """
+    try:
+        data = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+    # Treat anything but an entry as written by _store_cached as a miss
+    if not isinstance(data, dict) or data.keys() != set(_Solution._fields):
+        return None
+    variables = data["variables"]
+    if not (
+        isinstance(data["root"], float)
+        and isinstance(data["divergent"], bool)
+        and isinstance(data["invalid"], bool)
+        and isinstance(data["asymptotics"], str)
+        and isinstance(data["recurrence"], str)
+        and isinstance(data["function"], str)
+        and isinstance(variables, list)
+        and variables
+        and all(isinstance(var, str) for var in variables)
+    ):
+        return None
+    data["variables"] = tuple(variables)
+    return _Solution(**data)
+
+
+def _store_cached(path: Path, solution: _Solution) -> None:
+    """Write a solution to the cache, atomically; failures are ignored.
+
+    The first entry written for a version of the package removes the caches
+    of other versions, and a full cache directory loses its older half.
+
+    Args:
+        path: The cache file.
+        solution: The solution to store.
+    """
+    cache_dir = path.parent
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        if cache_dir.is_dir():
+            _prune_cache(cache_dir)
+        else:
+            _remove_stale_caches(cache_dir)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(solution._asdict()))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _prune_cache(cache_dir: Path) -> None:
+    """Remove the older half of the entries if the cache directory is full.
+
+    Args:
+        cache_dir: The cache directory.
+    """
+    entries = list(os.scandir(cache_dir))
+    if len(entries) < _CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[: len(entries) - _CACHE_MAX_ENTRIES // 2]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def _remove_stale_caches(cache_dir: Path) -> None:
+    """Remove the cache directories of other versions of the package.
+
+    Only directories named like the ones _cache_dir creates are removed;
+    anything else in the parent directory is left alone.
+
+    Args:
+        cache_dir: The cache directory of this version.
+    """
+    import shutil
+
+    if not cache_dir.parent.is_dir():
+        return
+    for entry in os.scandir(cache_dir.parent):
+        if (
+            entry.name != cache_dir.name
+            and _is_cache_dir_name(entry.name)
+            and entry.is_dir(follow_symlinks=False)
+        ):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _is_cache_dir_name(name: str) -> bool:
+    """Check whether a name is a source digest, as used by _cache_dir.
+
+    Args:
+        name: The directory name.
+
+    Returns:
+        True if the name consists of 2 * _CACHE_DIGEST_SIZE lowercase hex digits.
+    """
+    return len(name) == 2 * _CACHE_DIGEST_SIZE and all(
+        char in "0123456789abcdef" for char in name
+    )
 
 
 def _get_input(input_arg: str | None) -> str:
@@ -116,16 +507,20 @@ def _get_input(input_arg: str | None) -> str:
         The input text.
     """
     if input_arg is None:
-        # Read from stdin
-        if sys.stdin.isatty():
+        # Read from stdin, as bytes in one go and decoded once
+        stdin = sys.stdin.buffer
+        if stdin.isatty():
             # Interactive mode - prompt for input
             print("Enter recurrence relation (Ctrl+D to finish):", file=sys.stderr)
-        return sys.stdin.read()
+        return stdin.read().decode("utf-8", "replace")
 
-    # Check if it's a file path
-    path = Path(input_arg)
-    if path.exists() and path.is_file():
-        return path.read_text()
+    # Check if it's a file path; the stat is skipped for arguments that look
+    # like a recurrence, with both '=' and '(' (file names rarely have both)
+    looks_like_recurrence = "\n" in input_arg or ("=" in input_arg and "(" in input_arg)
+    if not looks_like_recurrence:
+        path = Path(input_arg)
+        if path.is_file():
+            return path.read_text()
 
     # Treat as direct recurrence string
     return input_arg
@@ -144,67 +539,80 @@ def _error(message: str, as_json: bool) -> None:
         print(f"Error: {message}", file=sys.stderr)
 
 
-def _output_json(rec: Recurrence, root: float, verbose: bool) -> None:
-    """Output results as JSON.
+def _json_result(solution: _Solution, verbose: bool) -> dict[str, object]:
+    """Build the JSON output for a solution.
 
     Args:
-        rec: The parsed recurrence.
-        root: The solved root.
+        solution: The solved recurrence.
         verbose: Whether to include verbose information.
-    """
-
-    # Check for special cases
-    is_divergent = math.isinf(root)
-    is_invalid = root >= PENALTY
 
+    Returns:
+        The JSON-serializable result.
+    """
     result: dict[str, object] = {"ok": True}
 
-    if is_divergent:
+    if solution.divergent:
         result["divergent"] = True
-    elif is_invalid:
+    elif solution.invalid:
         result["ok"] = False
         result["error"] = "No valid root found (non-positive shifts)"
     else:
         result["divergent"] = False
-        result["root"] = {rec.lhs.vars[0]: root}
-        result["asymptotics"] = format_asymptotics(rec, root)
+        result["root"] = {solution.variables[0]: solution.root}
+        result["asymptotics"] = solution.asymptotics
 
     if verbose:
-        result["recurrence"] = format_recurrence(rec)
-        result["function"] = rec.lhs.func
-        result["variables"] = rec.lhs.vars
+        result["recurrence"] = solution.recurrence
+        result["function"] = solution.function
+        result["variables"] = solution.variables
+
+    return result
+
+
+def _result_line(solution: _Solution) -> str:
+    """Return the one-line text result for a solution.
+
+    Args:
+        solution: The solved recurrence.
+
+    Returns:
+        The asymptotics, or a note on why there are none.
+    """
+    if solution.divergent:
+        return "Result: Divergent (infinite growth)"
+    if solution.invalid:
+        return "Result: No valid root (check for non-positive shifts)"
+    return solution.asymptotics
+
 
-    print(json.dumps(result, indent=2))
+def _output_json(solution: _Solution, verbose: bool) -> None:
+    """Output results as JSON.
+
+    Args:
+        solution: The solved recurrence.
+        verbose: Whether to include verbose information.
+    """
+    print(json.dumps(_json_result(solution, verbose), indent=2))
 
 
-def _output_text(rec: Recurrence, root: float, verbose: bool) -> None:
+def _output_text(solution: _Solution, verbose: bool) -> None:
     """Output results as human-readable text.
 
     Args:
-        rec: The parsed recurrence.
-        root: The solved root.
+        solution: The solved recurrence.
         verbose: Whether to include verbose information.
     """
 
     if verbose:
-        print(f"Recurrence: {format_recurrence(rec)}")
-        print(f"Function:   {rec.lhs.func}")
-        print(f"Variable:   {rec.lhs.vars[0]}")
+        print(f"Recurrence: {solution.recurrence}")
+        print(f"Function:   {solution.function}")
+        print(f"Variable:   {solution.variables[0]}")
 
-    # Check for special cases
-    is_divergent = math.isinf(root)
-    is_invalid = root >= PENALTY
-
-    if is_divergent:
-        print("Result: Divergent (infinite growth)")
-    elif is_invalid:
-        print("Result: No valid root (check for non-positive shifts)")
+    if verbose and not (solution.divergent or solution.invalid):
+        print(f"Root:       {solution.root}")
+        print(f"Asymptotics: {solution.asymptotics}")
     else:
-        if verbose:
-            print(f"Root:       {root}")
-            print(f"Asymptotics: {format_asymptotics(rec, root)}")
-        else:
-            print(format_asymptotics(rec, root))
+        print(_result_line(solution))
 
 
 if __name__ == "__main__":